@@ -9,7 +9,7 @@ Usage:
 import json
 from pathlib import Path
 import typer
-from scripts.utils.llm_client import call_llm
+from scripts.utils.llm_client import CACHE_MAX_TEMPERATURE, call_llm, first_json_text, stream_llm
 from scripts.utils.midi_utils import load_prompt, create_midi_from_json
 
 app = typer.Typer()
@@ -32,12 +32,18 @@ def generate_melody_core(
     system_prompt = load_prompt("melody")
     user_prompt = f"Create a melody for: {description}"
     
-    response = call_llm(
+    request = dict(
         prompt=user_prompt,
         system_prompt=system_prompt,
         temperature=temperature,
         max_tokens=4000,  # 2.5-flash uses tokens for internal reasoning
     )
+    if temperature <= CACHE_MAX_TEMPERATURE:
+        # Cacheable request: a full response can come from (and go to) the cache
+        response = call_llm(**request)
+    else:
+        # Only the melody JSON object is needed: stop the stream once it closes
+        response = first_json_text(stream_llm(**request))
     
     # Parse JSON response
     try:
@@ -6,16 +6,32 @@ Usage:
     python scripts/midi/generate_vocal_melody.py part1.mid part2.mid harmony.mid -l lyrics.txt -o vocal.mid
 """
 
+import functools
 import json
 import os
+import re
 from pathlib import Path
+import numpy as np
 import typer
-from scripts.utils.llm_client import call_llm
-from scripts.utils.midi_utils import load_prompt, extract_melody_data, create_midi_from_json
-from scripts.utils.musicxml_utils import create_musicxml_with_lyrics
-from scripts.utils import cfg
+from scripts.utils.llm_client import call_llm, call_llm_candidates
+from scripts.utils.midi_utils import LyricNote, load_prompt, extract_melody_summary, create_midi_from_json
 
-app = typer.Typer()
+# Note count from which map_words_to_notes() uses the numba-compiled kernel.
+# Plain Python takes ~0.6 us per note, importing numba ~0.3 s, so JIT only
+# pays off for very long inputs (a song has at most a few hundred notes)
+_JIT_MIN_NOTES = 500_000
+
+
+# Section headers that end the first verse (except [Verse 1] or [Verse])
+_SECTION_BREAK = re.compile(r'\[(?:Chorus|Verse 2|Bridge|Outro)\]')
+
+# Structural markers in parentheses like (Verse 1), (Chorus), etc.
+_PAREN_MARKER = re.compile(r'^\s*\([A-Za-z\s\d]+\)\s*$')
+
+
+class NonJSONResponseError(ValueError):
+    """Raised when an LLM response starts with prose instead of JSON."""
+    pass
 
 
 def extract_first_verse(lyrics_text: str) -> str:
@@ -34,17 +50,16 @@ def extract_first_verse(lyrics_text: str) -> str:
     Returns:
         First verse text only (exactly 4 lines for 8-measure arrangement)
     """
-    import re
     lines = lyrics_text.split('\n')
     first_verse_lines = []
     
     for line in lines:
         # Stop at section markers (except [Verse 1] or [Verse])
-        if any(marker in line for marker in ['[Chorus]', '[Verse 2]', '[Bridge]', '[Outro]']):
+        if _SECTION_BREAK.search(line):
             break
         
         # Skip structural markers in parentheses like (Verse 1), (Chorus), etc.
-        if re.match(r'^\s*\([A-Za-z\s\d]+\)\s*$', line):
+        if _PAREN_MARKER.match(line):
             continue
         
         # Skip empty lines and section headers, but include lyrics
@@ -72,7 +87,7 @@ def map_words_to_notes(lyrics_text: str, vocal_notes: list) -> list:
         vocal_notes: List of note dicts with 'pitch' and 'duration'
     
     Returns:
-        List of tuples (word, pitch, start_time, duration)
+        List of LyricNote (word, pitch, start_time, duration) tuples
     """
     # Note: Structural markers already filtered out in extract_first_verse()
     words = lyrics_text.replace('\n', ' ').split()
@@ -86,45 +101,106 @@ def map_words_to_notes(lyrics_text: str, vocal_notes: list) -> list:
         print(f"   ⚠️  Empty words or notes, skipping mapping")
         return []
     
-    # Calculate cumulative times
-    current_time = 0
-    notes_with_time = []
-    for note in vocal_notes:
-        notes_with_time.append({
-            'pitch': note['pitch'],
-            'duration': note['duration'],
-            'start_time': current_time
-        })
-        current_time += note['duration']
+    # Note columns as arrays for the mapping kernel
+    n = len(vocal_notes)
+    pitch_arr = np.fromiter((note['pitch'] for note in vocal_notes), dtype=np.int16, count=n)
+    dur_arr = np.fromiter((note['duration'] for note in vocal_notes), dtype=np.float64, count=n)
     
     # Simple mapping: distribute notes evenly across words
     result = []
-    notes_per_word = max(1, len(notes_with_time) // len(words))
+    notes_per_word = max(1, n // len(words))
     
     print(f"   Notes per word: ~{notes_per_word}")
     
-    for i, word in enumerate(words):
-        start_idx = i * notes_per_word
-        end_idx = start_idx + notes_per_word if i < len(words) - 1 else len(notes_with_time)
+    kernel = _map_core
+    if n >= _JIT_MIN_NOTES:
+        kernel = _compiled_map_core() or _map_core
+    count, pitch_out, start_out, duration_out = kernel(pitch_arr, dur_arr, notes_per_word, len(words))
+    
+    for i in range(count):
+        word = words[i]
+        pitch = int(pitch_out[i])
+        start_time = float(start_out[i])
+        duration = float(duration_out[i])
         
-        if start_idx >= len(notes_with_time):
+        result.append(LyricNote(word, pitch, start_time, duration))
+        print(f"   '{word}' → pitch {pitch} (MIDI), {start_time:.2f}s, {duration:.2f}s")
+    
+    print(f"   ✅ Mapped {len(result)} words to notes")
+    return result
+
+
+def _map_core(pitch, duration, notes_per_word, n_words):
+    """
+    Group notes into per-word segments in a single pass.
+    
+    Word i covers notes [i * notes_per_word, (i + 1) * notes_per_word), the
+    last word takes all remaining notes. Written in the subset of Python
+    that numba compiles (see _compiled_map_core()).
+    
+    Args:
+        pitch: int16 array of note pitches
+        duration: float64 array of note durations
+        notes_per_word: Notes assigned to each word (>= 1)
+        n_words: Number of words
+    
+    Returns:
+        Tuple (count, pitch_out, start_out, duration_out) where only the first
+        `count` entries of each output array are valid. Per word: pitch of the
+        longest note, start time, total duration.
+    """
+    n = pitch.shape[0]
+    pitch_out = np.empty(n_words, dtype=np.int16)
+    start_out = np.empty(n_words, dtype=np.float64)
+    duration_out = np.empty(n_words, dtype=np.float64)
+    
+    count = 0
+    note_idx = 0
+    current_time = 0.0
+    
+    for i in range(n_words):
+        start_idx = i * notes_per_word
+        if start_idx >= n:
             break
+        end_idx = start_idx + notes_per_word if i < n_words - 1 else n
         
-        word_notes = notes_with_time[start_idx:end_idx]
-        if not word_notes:
-            continue
+        # Running max picks the first longest note, like max()
+        best = start_idx
+        total = 0.0
+        for j in range(start_idx, end_idx):
+            if duration[j] > duration[best]:
+                best = j
+            total += duration[j]
         
-        # Use the longest note's pitch (most prominent)
-        longest_note = max(word_notes, key=lambda n: n['duration'])
-        pitch = longest_note['pitch']
-        start_time = word_notes[0]['start_time']
-        duration = sum(n['duration'] for n in word_notes)
+        # Advance the cumulative start time up to this word's first note
+        while note_idx < start_idx:
+            current_time += duration[note_idx]
+            note_idx += 1
         
-        result.append((word, pitch, start_time, duration))
-        print(f"   '{word}' → pitch {pitch} (MIDI), {start_time:.2f}s, {duration:.2f}s")
+        pitch_out[count] = pitch[best]
+        start_out[count] = current_time
+        duration_out[count] = total
+        count += 1
     
-    print(f"   ✅ Mapped {len(result)} words to notes")
-    return result
+    return count, pitch_out, start_out, duration_out
+
+
+@functools.lru_cache(maxsize=1)
+def _compiled_map_core():
+    """
+    Compile _map_core with numba on first use.
+    
+    numba is imported here rather than at module load, so runs that never
+    reach _JIT_MIN_NOTES don't pay for it.
+    
+    Returns:
+        The compiled kernel, or None if numba isn't installed
+    """
+    try:
+        from numba import njit
+    except ImportError:
+        return None
+    return njit(cache=True)(_map_core)
 
 
 def generate_vocal_audio(
@@ -149,6 +225,7 @@ def generate_vocal_audio(
         Path to generated WAV file
     """
     import pysinsy
+    from scripts.utils.musicxml_utils import create_musicxml_with_lyrics
     
     print(f"[GENERATE_VOCAL_AUDIO] Starting with PySinsy")
     print(f"[GENERATE_VOCAL_AUDIO] Words mapped: {len(word_mapping)}")
@@ -213,7 +290,8 @@ def generate_vocal_melody_core(
     temperature: float = 0.8,
     generate_audio: bool = False,  # Disabled: no working English singing synthesis
     audio_output_path: Path = None,
-) -> dict:
+    num_candidates: int = 1,
+):
     """
     Core logic to generate vocal melody (MIDI + optional WAV audio).
     
@@ -225,21 +303,31 @@ def generate_vocal_melody_core(
         temperature: Creativity level (0.0-1.0)
         generate_audio: Whether to generate WAV audio with TTS (default: True)
         audio_output_path: Where to save WAV file (default: same dir as MIDI)
+        num_candidates: Number of alternative vocal melodies to generate from
+            a single LLM request (default: 1)
     
     Returns:
-        Dictionary with vocal melody data (includes 'audio_path' if generated)
+        Dictionary with vocal melody data (includes 'audio_path' if generated).
+        If num_candidates > 1, a list of such dictionaries instead.
+    
+    Raises:
+        ValueError: If num_candidates is less than 1
     """
-    # Extract data from all 3 instrumental tracks
-    melody_data = extract_melody_data(melody_path)
-    continuation_data = extract_melody_data(continuation_path)
-    harmony_data = extract_melody_data(harmony_path)
+    # Check up front: inside the retry loop this would look like bad JSON
+    if num_candidates < 1:
+        raise ValueError(f"num_candidates must be at least 1, got {num_candidates}")
+    
+    # Only tempo and note counts are needed for the prompt
+    melody_data = extract_melody_summary(melody_path)
+    continuation_data = extract_melody_summary(continuation_path)
+    harmony_data = extract_melody_summary(harmony_path)
     
     # Get first verse only
     first_verse = extract_first_verse(lyrics_text)
     
     # Calculate total instrumental context
-    total_melody_notes = len(melody_data["notes"]) + len(continuation_data["notes"])
-    total_harmony_notes = len(harmony_data["notes"])
+    total_melody_notes = melody_data["num_notes"] + continuation_data["num_notes"]
+    total_harmony_notes = harmony_data["num_notes"]
     
     # Build prompt
     system_prompt = load_prompt("vocals")
@@ -279,7 +367,9 @@ OUTPUT INSTRUCTIONS: Return ONLY valid JSON. No comments, no // annotations, no
     
     # Retry logic for flaky LLM responses
     max_retries = 3
+    max_tokens = 15000  # Needs room for analysis + generation
     import time
+    responses = []
     
     for attempt in range(max_retries):
         try:
@@ -287,66 +377,124 @@ OUTPUT INSTRUCTIONS: Return ONLY valid JSON. No comments, no // annotations, no
                 print(f"⚠️  Retry attempt {attempt + 1}/{max_retries}...")
                 time.sleep(1)  # Brief pause between retries
             
-            response = call_llm(
-                prompt=user_prompt,
-                system_prompt=system_prompt,
-                temperature=temperature,
-                max_tokens=15000,  # Needs room for analysis + generation
-            )
-            
-            # Check for empty response
-            if not response or len(response.strip()) == 0:
-                raise ValueError("Empty response from LLM")
-            
-            # Clean up response
-            response = response.strip()
-            if response.startswith("```"):
-                lines = response.split('\n')
-                response = '\n'.join(lines[1:-1])
-            
-            # Remove // comments from JSON (LLMs love to add these)
-            import re
-            response = re.sub(r'//.*$', '', response, flags=re.MULTILINE)
+            if num_candidates == 1:
+                responses = [call_llm(
+                    prompt=user_prompt,
+                    system_prompt=system_prompt,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                )]
+            else:
+                # One request for all candidates: the shared prompt is only processed once
+                responses = call_llm_candidates(
+                    prompt=user_prompt,
+                    num_candidates=num_candidates,
+                    system_prompt=system_prompt,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                )
             
-            vocal_data = json.loads(response)
+            candidates = []
+            for response in responses:
+                try:
+                    candidates.append(_parse_vocal_response(response))
+                except (json.JSONDecodeError, ValueError) as e:
+                    # Only fail the attempt if every candidate is invalid
+                    if num_candidates == 1:
+                        raise
+                    print(f"⚠️  Discarding invalid candidate: {e}")
+                    last_error = e
             
-            # Ensure tempo matches
-            vocal_data["tempo"] = melody_data["tempo"]
+            if not candidates:
+                raise last_error
             
             print(f"✓ Successfully generated vocals on attempt {attempt + 1}")
             
-            # Always create word mapping (needed for MIDI lyrics embedding)
-            word_mapping = map_words_to_notes(first_verse, vocal_data["notes"])
-            vocal_data["word_mapping"] = word_mapping  # Include in result
-            
-            # Generate Synthesizer V singing audio if requested (only after successful MIDI generation)
-            if generate_audio:
-                try:
-                    # Determine audio output path
-                    if audio_output_path is None:
-                        audio_output_path = melody_path.parent.parent / "audio" / f"{melody_path.stem}_vocals.wav"
-                    
-                    # Generate singing WAV file using Synthesizer V + REAPER
-                    generate_vocal_audio(vocal_data, word_mapping, audio_output_path)
-                    vocal_data["audio_path"] = str(audio_output_path)
-                    
-                    print(f"✓ Generated vocal audio: {audio_output_path}")
-                except Exception as e:
-                    print(f"⚠ Failed to generate vocal audio: {e}")
-                    print("  Continuing with MIDI only...")
-                    vocal_data["audio_path"] = None
+            for i, vocal_data in enumerate(candidates):
+                # Ensure tempo matches
+                vocal_data["tempo"] = melody_data["tempo"]
+                
+                # Always create word mapping (needed for MIDI lyrics embedding)
+                word_mapping = map_words_to_notes(first_verse, vocal_data["notes"])
+                vocal_data["word_mapping"] = word_mapping  # Include in result
+                
+                # Generate Synthesizer V singing audio if requested (only after successful MIDI generation)
+                if generate_audio:
+                    try:
+                        # Determine audio output path
+                        if audio_output_path is None:
+                            candidate_audio_path = melody_path.parent.parent / "audio" / f"{melody_path.stem}_vocals.wav"
+                        else:
+                            candidate_audio_path = audio_output_path
+                        if num_candidates > 1:
+                            candidate_audio_path = candidate_audio_path.with_name(
+                                f"{candidate_audio_path.stem}_{i + 1}{candidate_audio_path.suffix}"
+                            )
+                        
+                        # Generate singing WAV file using Synthesizer V + REAPER
+                        generate_vocal_audio(vocal_data, word_mapping, candidate_audio_path)
+                        vocal_data["audio_path"] = str(candidate_audio_path)
+                        
+                        print(f"✓ Generated vocal audio: {candidate_audio_path}")
+                    except Exception as e:
+                        print(f"⚠ Failed to generate vocal audio: {e}")
+                        print("  Continuing with MIDI only...")
+                        vocal_data["audio_path"] = None
             
-            return vocal_data
+            if num_candidates == 1:
+                return candidates[0]
+            return candidates
             
         except (json.JSONDecodeError, ValueError) as e:
             if attempt == max_retries - 1:
                 # Last attempt failed, raise error
-                raise ValueError(f"LLM did not return valid JSON after {max_retries} attempts: {e}\nLast response: {response}")
+                raise ValueError(f"LLM did not return valid JSON after {max_retries} attempts: {e}\nLast response: {responses[-1] if responses else ''}")
             # Otherwise continue to next retry
             print(f"⚠️  Attempt {attempt + 1} failed: {e}")
+            
+            if isinstance(e, NonJSONResponseError):
+                # Prose instead of JSON: cool down and shorten the next attempt
+                temperature = max(0.1, temperature * 0.5)
+                max_tokens = max(8000, max_tokens // 2)
+                print(f"   Retrying with temperature={temperature:.2f}, max_tokens={max_tokens}")
+
+
+def _parse_vocal_response(response: str) -> dict:
+    """
+    Parse a raw LLM response into vocal melody JSON.
+    
+    Args:
+        response: Raw LLM response text
+    
+    Returns:
+        Parsed vocal data dict
+    
+    Raises:
+        ValueError: If the response is empty
+        NonJSONResponseError: If the response doesn't start with a JSON object/array
+        json.JSONDecodeError: If the response is not valid JSON
+    """
+    # Check for empty response
+    if not response or len(response.strip()) == 0:
+        raise ValueError("Empty response from LLM")
+    
+    # Clean up response
+    response = response.strip()
+    if response.startswith("```"):
+        lines = response.split('\n')
+        response = '\n'.join(lines[1:-1])
+    
+    # Remove // comments from JSON (LLMs love to add these)
+    response = re.sub(r'//.*$', '', response, flags=re.MULTILINE)
+    
+    # Prose like "I'm sorry..." or "Here is your melody" can never parse,
+    # so fail fast instead of running the JSON parser over the whole text
+    if not response.lstrip().startswith(('{', '[')):
+        raise NonJSONResponseError(f"non-JSON prefix: {response.lstrip()[:40]!r}")
+    
+    return json.loads(response)
 
 
-@app.command()
 def generate(
     melody: str = typer.Argument(..., help="Original melody MIDI file"),
     continuation: str = typer.Argument(..., help="Continuation MIDI file"),
@@ -451,5 +599,8 @@ def generate(
 
 
 if __name__ == "__main__":
+    # Build the CLI only when run as a script; pipelines import the *_core functions
+    app = typer.Typer()
+    app.command()(generate)
     app()
 
@@ -15,8 +15,6 @@ import typer
 from scripts.utils.llm_client import call_llm
 from scripts.utils.midi_utils import load_prompt, extract_melody_data, create_midi_from_json
 
-app = typer.Typer()
-
 
 def combine_melodies(part1: dict, part2: dict) -> dict:
     """Combine two melody parts into one sequence."""
@@ -159,7 +157,6 @@ OUTPUT INSTRUCTIONS: Return ONLY valid JSON. No explanations, no text before or
             print(f"⚠️  Attempt {attempt + 1} failed: {e}")
 
 
-@app.command()
 def generate(
     part1: str = typer.Argument(..., help="First MIDI file (original melody)"),
     part2: str = typer.Argument(..., help="Second MIDI file (continuation)"),
@@ -232,5 +229,8 @@ def generate(
 
 
 if __name__ == "__main__":
+    # Build the CLI only when run as a script; pipelines import the *_core functions
+    app = typer.Typer()
+    app.command()(generate)
     app()
 
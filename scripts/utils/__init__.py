@@ -1,7 +1,15 @@
 """Synthaia utilities package."""
 
-from . import cfg
-from .llm_client import call_llm, test_connection
+import importlib
 
+# Submodules are imported on first use (PEP 562) so that importing
+# scripts.utils doesn't pull in langchain or read .env up front.
 __all__ = ["cfg", "call_llm", "test_connection"]
 
+
+def __getattr__(name):
+    if name == "cfg":
+        return importlib.import_module(".cfg", __name__)
+    if name in ("call_llm", "test_connection"):
+        return getattr(importlib.import_module(".llm_client", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -3,74 +3,136 @@ Configuration management for Synthaia.
 Loads settings from .env file and provides them to all scripts.
 """
 
+import functools
 import os
+from dataclasses import dataclass, field, fields
 from pathlib import Path
-from dotenv import load_dotenv
 
-# Load .env file from project root
+# .env file in project root
 project_root = Path(__file__).parent.parent.parent
 env_path = project_root / ".env"
-load_dotenv(env_path)
 
-# AI Provider Settings
-USE_CLOUD = os.getenv("USE_CLOUD", "False").lower() == "true"
-PROVIDER = os.getenv("PROVIDER", "ollama")
 
-# API Keys
-GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY", "")
-GOOGLE_CLOUD_TTS_API_KEY = os.getenv("GOOGLE_CLOUD_TTS_API_KEY", "")
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
-ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY", "")
+def _env_bool(name: str, default: str = "") -> bool:
+    """Parse a boolean environment variable ("1", "true", "yes" are truthy)."""
+    return os.environ.get(name, default).lower() in ("1", "true", "yes")
 
-# Model Configuration
-LOCAL_MODEL = os.getenv("LOCAL_MODEL", "llama3.1:8b")
-GOOGLE_MODEL = os.getenv("GOOGLE_MODEL", "gemini-2.5-flash")
-CLOUD_MODEL = os.getenv("CLOUD_MODEL", "gpt-4")
 
-# Cost Controls
-MAX_TOKENS_PER_DAY = int(os.getenv("MAX_TOKENS_PER_DAY", "10000"))
-MAX_TOKENS_PER_REQUEST = int(os.getenv("MAX_TOKENS_PER_REQUEST", "2000"))
+@dataclass(frozen=True)
+class Config:
+    """All Synthaia settings, parsed once from the environment / .env."""
+    
+    # AI Provider Settings
+    use_cloud: bool
+    provider: str
+    
+    # API Keys (kept out of repr so they don't end up in logs)
+    google_api_key: str = field(repr=False)
+    google_cloud_tts_api_key: str = field(repr=False)
+    openai_api_key: str = field(repr=False)
+    anthropic_api_key: str = field(repr=False)
+    
+    # Model Configuration
+    local_model: str
+    google_model: str
+    cloud_model: str
+    
+    # Cost Controls
+    max_tokens_per_day: int
+    max_tokens_per_request: int
+    
+    # Local cache of low-temperature LLM responses
+    llm_cache: bool
+    
+    # Audio Configuration
+    default_soundfont_path: str
+    sample_rate: int
+    
+    # Synthesizer V + REAPER Configuration (AI Singing Synthesis)
+    synthv_voice: str
+    reaper_executable: str
+    synthv_vst_path: str
+    
+    # Optional headless Synth V render command ("{input}"/"{output}" placeholders)
+    synthv_render_command: str
 
-# Audio Configuration
-DEFAULT_SOUNDFONT_PATH = os.getenv(
-    "DEFAULT_SOUNDFONT_PATH", 
-    "/usr/share/sounds/sf2/FluidR3_GM.sf2"
-)
-SAMPLE_RATE = int(os.getenv("SAMPLE_RATE", "44100"))
 
-# Synthesizer V + REAPER Configuration (AI Singing Synthesis)
-SYNTHV_VOICE = os.getenv("SYNTHV_VOICE", "SOLARIA II")  # Default voice database
-REAPER_EXECUTABLE = os.getenv("REAPER_EXECUTABLE", "/Applications/REAPER.app/Contents/MacOS/REAPER")
-SYNTHV_VST_PATH = os.getenv("SYNTHV_VST_PATH", "/Library/Audio/Plug-Ins/VST3/Synthesizer V Studio 2 Pro.vst3")
+@functools.lru_cache(maxsize=1)
+def get_config() -> Config:
+    """
+    Load .env and return the parsed settings.
+    
+    Cached, so .env is read once per process. importlib.reload(cfg) creates a
+    fresh cache, which is how the API picks up provider changes.
+    """
+    from dotenv import load_dotenv
+    load_dotenv(env_path)
+    
+    return Config(
+        use_cloud=_env_bool("USE_CLOUD", "False"),
+        provider=os.getenv("PROVIDER", "ollama"),
+        google_api_key=os.getenv("GOOGLE_API_KEY", ""),
+        google_cloud_tts_api_key=os.getenv("GOOGLE_CLOUD_TTS_API_KEY", ""),
+        openai_api_key=os.getenv("OPENAI_API_KEY", ""),
+        anthropic_api_key=os.getenv("ANTHROPIC_API_KEY", ""),
+        local_model=os.getenv("LOCAL_MODEL", "llama3.1:8b"),
+        google_model=os.getenv("GOOGLE_MODEL", "gemini-2.5-flash"),
+        cloud_model=os.getenv("CLOUD_MODEL", "gpt-4"),
+        max_tokens_per_day=int(os.getenv("MAX_TOKENS_PER_DAY", "10000")),
+        max_tokens_per_request=int(os.getenv("MAX_TOKENS_PER_REQUEST", "2000")),
+        llm_cache=_env_bool("LLM_CACHE", "True"),
+        default_soundfont_path=os.getenv(
+            "DEFAULT_SOUNDFONT_PATH",
+            "/usr/share/sounds/sf2/FluidR3_GM.sf2"
+        ),
+        sample_rate=int(os.getenv("SAMPLE_RATE", "44100")),
+        synthv_voice=os.getenv("SYNTHV_VOICE", "SOLARIA II"),  # Default voice database
+        reaper_executable=os.getenv("REAPER_EXECUTABLE", "/Applications/REAPER.app/Contents/MacOS/REAPER"),
+        synthv_vst_path=os.getenv("SYNTHV_VST_PATH", "/Library/Audio/Plug-Ins/VST3/Synthesizer V Studio 2 Pro.vst3"),
+        synthv_render_command=os.getenv("SYNTHV_RENDER_COMMAND", ""),
+    )
+
+
+_CONFIG_FIELDS = frozenset(f.name for f in fields(Config))
+
+
+def __getattr__(name):
+    """Backwards-compatible aliases: cfg.USE_CLOUD -> get_config().use_cloud."""
+    attr = name.lower()
+    if name.isupper() and attr in _CONFIG_FIELDS:
+        return getattr(get_config(), attr)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # Derived settings
 def get_active_model() -> str:
     """Returns the active model name based on USE_CLOUD setting."""
-    if USE_CLOUD:
-        if PROVIDER == "google":
-            return GOOGLE_MODEL
-        elif PROVIDER == "openai":
-            return CLOUD_MODEL
+    config = get_config()
+    if config.use_cloud:
+        if config.provider == "google":
+            return config.google_model
+        elif config.provider == "openai":
+            return config.cloud_model
         else:
-            return CLOUD_MODEL
-    return LOCAL_MODEL
+            return config.cloud_model
+    return config.local_model
 
 def get_active_provider() -> str:
     """Returns the active provider based on USE_CLOUD setting."""
-    if USE_CLOUD:
-        if PROVIDER == "google" and GOOGLE_API_KEY:
+    config = get_config()
+    if config.use_cloud:
+        if config.provider == "google" and config.google_api_key:
             return "google"
-        elif PROVIDER == "openai" and OPENAI_API_KEY:
+        elif config.provider == "openai" and config.openai_api_key:
             return "openai"
-        elif PROVIDER == "anthropic" and ANTHROPIC_API_KEY:
+        elif config.provider == "anthropic" and config.anthropic_api_key:
             return "anthropic"
-        elif GOOGLE_API_KEY:
+        elif config.google_api_key:
             return "google"
-        elif OPENAI_API_KEY:
+        elif config.openai_api_key:
             return "openai"
-        elif ANTHROPIC_API_KEY:
+        elif config.anthropic_api_key:
             return "anthropic"
         else:
             raise ValueError("USE_CLOUD=True but no API key found")
-    return PROVIDER
-
+    return config.provider
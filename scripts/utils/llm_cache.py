@@ -0,0 +1,102 @@
+"""
+On-disk cache of LLM responses for Synthaia.
+
+Responses are stored in a small SQLite database keyed on a BLAKE2b hash of
+(provider, model, temperature, max_tokens, system_prompt, prompt). Used by call_llm()
+for low-temperature / deterministic calls, where the same prompt is
+expected to produce the same answer (retries, regenerations, test runs).
+"""
+
+import hashlib
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Optional
+
+# Default cache location (project root, ignored by git)
+CACHE_PATH = Path(__file__).parent.parent.parent / ".cache" / "llm_cache.sqlite3"
+
+_conn = None
+_lock = threading.Lock()
+
+
+def make_key(
+    provider: str,
+    model: str,
+    temperature: float,
+    max_tokens: int,
+    system_prompt: Optional[str],
+    prompt: str,
+) -> str:
+    """
+    Build the cache key for one LLM request.
+    
+    Args:
+        provider: Active provider name
+        model: Model name
+        temperature: Sampling temperature (rounded to 3 decimals)
+        max_tokens: Response token limit (a shorter limit may truncate)
+        system_prompt: System prompt, if any
+        prompt: User prompt
+    
+    Returns:
+        Hex digest identifying the request
+    """
+    h = hashlib.blake2b(digest_size=16)
+    for part in (provider, model, f"{round(temperature, 3)}", f"{max_tokens}", system_prompt or "", prompt):
+        data = part.encode("utf-8")
+        # Length-prefix each part so ("ab", "c") and ("a", "bc") differ
+        h.update(len(data).to_bytes(8, "little"))
+        h.update(data)
+    return h.hexdigest()
+
+
+def _connection() -> sqlite3.Connection:
+    """Open (once) the cache database, creating it if needed."""
+    global _conn
+    if _conn is None:
+        CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        _conn = sqlite3.connect(str(CACHE_PATH), check_same_thread=False)
+        _conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, response TEXT NOT NULL)"
+        )
+        _conn.commit()
+    return _conn
+
+
+def lookup(key: str) -> Optional[str]:
+    """
+    Return the cached response for a key, or None on a miss.
+    
+    Args:
+        key: Key from make_key()
+    """
+    with _lock:
+        row = _connection().execute(
+            "SELECT response FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+    return row[0] if row else None
+
+
+def store(key: str, response: str) -> None:
+    """
+    Save a response under a key (overwrites any existing entry).
+    
+    Args:
+        key: Key from make_key()
+        response: LLM response text
+    """
+    with _lock:
+        conn = _connection()
+        conn.execute(
+            "INSERT OR REPLACE INTO responses (key, response) VALUES (?, ?)", (key, response)
+        )
+        conn.commit()
+
+
+def clear() -> None:
+    """Delete all cached responses."""
+    with _lock:
+        conn = _connection()
+        conn.execute("DELETE FROM responses")
+        conn.commit()
@@ -3,23 +3,25 @@ LLM client for Synthaia.
 Provides a unified interface to call local (Ollama) or cloud (OpenAI/Anthropic) models.
 """
 
-from typing import Optional
-from langchain_community.chat_models import ChatOllama
+import asyncio
+import functools
+import hashlib
+import json
+from typing import Dict, Iterable, Iterator, List, Optional, Protocol, Sequence, Tuple, Union
 from langchain_core.messages import HumanMessage, SystemMessage
 
-try:
-    from langchain_openai import ChatOpenAI
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
+from scripts.utils import cfg, llm_cache
 
-try:
-    from langchain_google_genai import ChatGoogleGenerativeAI
-    GOOGLE_AVAILABLE = True
-except ImportError:
-    GOOGLE_AVAILABLE = False
+# Calls above this temperature bypass the response cache unless deterministic=True
+CACHE_MAX_TEMPERATURE = 0.2
 
-from scripts.utils import cfg
+# call_llm_many() packs prompts into one request only below both limits
+PACK_MAX_OUTPUT_TOKENS = 512
+PACK_MAX_PROMPTS = 10
+
+# System prompts at least this long (~1024 tokens, OpenAI's caching minimum)
+# get a provider prompt-cache key
+PROMPT_CACHE_MIN_CHARS = 4096
 
 
 class TokenLimitExceeded(Exception):
@@ -33,6 +35,7 @@ def call_llm(
     model: Optional[str] = None,
     temperature: float = 0.7,
     max_tokens: Optional[int] = None,
+    deterministic: bool = False,
 ) -> str:
     """
     Call the configured LLM with a prompt.
@@ -42,7 +45,63 @@ def call_llm(
         system_prompt: Optional system prompt to set context
         model: Override the default model from config
         temperature: Sampling temperature (0.0 = deterministic, 1.0 = creative)
-        max_tokens: Maximum tokens in response (uses cfg.MAX_TOKENS_PER_REQUEST if not set)
+        max_tokens: Maximum tokens in response (uses MAX_TOKENS_PER_REQUEST from config if not set)
+        deterministic: Cache the response even above the cache temperature
+            threshold (the caller accepts a repeated answer for the same prompt)
+    
+    Returns:
+        The LLM's response as a string
+    
+    Raises:
+        TokenLimitExceeded: If max_tokens exceeds configured limit
+        ValueError: If cloud is enabled but no API key is set
+        Exception: For other LLM errors
+    """
+    provider, model, max_tokens = _resolve_request(model, max_tokens)
+    
+    # Serve repeated low-temperature prompts from the local cache
+    cache_key = _cache_key(provider, model, temperature, max_tokens, system_prompt, prompt, deterministic)
+    if cache_key is not None:
+        cached = llm_cache.lookup(cache_key)
+        if cached is not None:
+            return cached
+    
+    messages = _build_messages(prompt, system_prompt)
+    
+    try:
+        llm = _get_client(provider, model, temperature, max_tokens)
+        response = llm.invoke(messages, **_request_options(provider, system_prompt))
+    except Exception as e:
+        raise Exception(f"LLM call failed: {str(e)}")
+    
+    if cache_key is not None:
+        llm_cache.store(cache_key, response.content)
+    return response.content
+
+
+async def acall_llm(
+    prompt: str,
+    system_prompt: Optional[str] = None,
+    model: Optional[str] = None,
+    temperature: float = 0.7,
+    max_tokens: Optional[int] = None,
+    deterministic: bool = False,
+) -> str:
+    """
+    Async version of call_llm().
+    
+    Uses the chat model's native non-blocking client (``ainvoke``), so several
+    calls can be in flight at once from one event loop. Safe to await from
+    the FastAPI handlers, unlike wrapping call_llm() in asyncio.run().
+    
+    Args:
+        prompt: The user prompt/question
+        system_prompt: Optional system prompt to set context
+        model: Override the default model from config
+        temperature: Sampling temperature (0.0 = deterministic, 1.0 = creative)
+        max_tokens: Maximum tokens in response (uses MAX_TOKENS_PER_REQUEST from config if not set)
+        deterministic: Cache the response even above the cache temperature
+            threshold (the caller accepts a repeated answer for the same prompt)
     
     Returns:
         The LLM's response as a string
@@ -52,14 +111,402 @@ def call_llm(
         ValueError: If cloud is enabled but no API key is set
         Exception: For other LLM errors
     """
-    # Determine max tokens
+    provider, model, max_tokens = _resolve_request(model, max_tokens)
+    
+    cache_key = _cache_key(provider, model, temperature, max_tokens, system_prompt, prompt, deterministic)
+    if cache_key is not None:
+        cached = llm_cache.lookup(cache_key)
+        if cached is not None:
+            return cached
+    
+    messages = _build_messages(prompt, system_prompt)
+    
+    try:
+        llm = _get_client(provider, model, temperature, max_tokens)
+        response = await llm.ainvoke(messages, **_request_options(provider, system_prompt))
+    except Exception as e:
+        raise Exception(f"LLM call failed: {str(e)}")
+    
+    if cache_key is not None:
+        llm_cache.store(cache_key, response.content)
+    return response.content
+
+
+async def acall_llm_batch(
+    prompts: List[str],
+    system_prompt: Optional[str] = None,
+    model: Optional[str] = None,
+    temperature: float = 0.7,
+    max_tokens: Optional[int] = None,
+) -> List[str]:
+    """
+    Run several independent prompts concurrently.
+    
+    Wall time is roughly that of the slowest request rather than the sum,
+    up to the provider's rate limit.
+    
+    Args:
+        prompts: User prompts to send
+        system_prompt: Optional system prompt shared by all prompts
+        model: Override the default model from config
+        temperature: Sampling temperature (0.0 = deterministic, 1.0 = creative)
+        max_tokens: Maximum tokens per response (uses MAX_TOKENS_PER_REQUEST from config if not set)
+    
+    Returns:
+        Responses in the same order as prompts
+    """
+    return list(await asyncio.gather(*(
+        acall_llm(
+            prompt,
+            system_prompt=system_prompt,
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+        )
+        for prompt in prompts
+    )))
+
+
+async def acall_llm_many(specs: Dict[str, dict]) -> Dict[str, str]:
+    """
+    Run independent, differently-parameterised LLM calls concurrently.
+    
+    For pipelines like "melody + lyrics + chords" whose calls don't depend on
+    each other, wall time becomes that of the slowest call instead of the
+    sum. Providers batch concurrent requests into the same decode steps on
+    their side, so this also keeps their GPUs busier. A local Ollama server
+    only does that when started with OLLAMA_NUM_PARALLEL > 1; otherwise it
+    queues the requests and they run one after another.
+    
+    Args:
+        specs: Name -> keyword arguments for acall_llm(), e.g.
+               {"lyrics": {"prompt": ..., "temperature": 0.9}}
+    
+    Returns:
+        Name -> response, with the same keys as specs
+    
+    Example:
+        results = await acall_llm_many({
+            "melody": {"prompt": melody_prompt, "system_prompt": melody_system},
+            "lyrics": {"prompt": lyrics_prompt},
+        })
+    """
+    responses = await asyncio.gather(*(acall_llm(**spec) for spec in specs.values()))
+    return dict(zip(specs.keys(), responses))
+
+
+def call_llm_many(
+    prompts: List[str],
+    max_output_tokens_each: Union[int, Sequence[int]],
+    system_prompt: Optional[str] = None,
+    model: Optional[str] = None,
+    temperature: float = 0.7,
+) -> List[str]:
+    """
+    Answer several short, independent prompts, packing them when it's cheaper.
+    
+    Output tokens are decoded one after another within a request, so packing
+    N prompts into one call makes the answers wait on each other; separate
+    concurrent requests finish in roughly the time of the longest answer.
+    For a handful of tiny outputs (titles, keywords) that difference is a
+    few dozen tokens, while N requests cost N prompt round trips and count
+    N times against provider rate limits. So prompts are packed into one
+    request asking for a JSON array only when the total expected output is
+    under PACK_MAX_OUTPUT_TOKENS and there are at most PACK_MAX_PROMPTS of
+    them; otherwise they are sent concurrently via acall_llm_batch().
+    
+    Not for use inside a running event loop (the concurrent path calls
+    asyncio.run); await acall_llm_batch() there instead.
+    
+    Args:
+        prompts: User prompts to answer
+        max_output_tokens_each: Expected max output tokens per prompt, either
+            one value for all prompts or one value per prompt
+        system_prompt: Optional system prompt shared by all prompts
+        model: Override the default model from config
+        temperature: Sampling temperature (0.0 = deterministic, 1.0 = creative)
+    
+    Returns:
+        Responses in the same order as prompts
+    
+    Raises:
+        TokenLimitExceeded: If a request exceeds the configured token limit
+        ValueError: If max_output_tokens_each doesn't match prompts
+        Exception: For other LLM errors
+    """
+    if not prompts:
+        return []
+    if isinstance(max_output_tokens_each, int):
+        max_output_tokens_each = [max_output_tokens_each] * len(prompts)
+    if len(max_output_tokens_each) != len(prompts):
+        raise ValueError(
+            f"Got {len(max_output_tokens_each)} token limits for {len(prompts)} prompts"
+        )
+    
+    total_output = sum(max_output_tokens_each)
+    if len(prompts) > 1 and total_output < PACK_MAX_OUTPUT_TOKENS and len(prompts) <= PACK_MAX_PROMPTS:
+        responses = _call_llm_packed(prompts, total_output, system_prompt, model, temperature)
+        if responses is not None:
+            return responses
+    
+    # Concurrent path: the longest limit covers every prompt
+    return asyncio.run(acall_llm_batch(
+        prompts,
+        system_prompt=system_prompt,
+        model=model,
+        temperature=temperature,
+        max_tokens=max(max_output_tokens_each),
+    ))
+
+
+def _call_llm_packed(
+    prompts: List[str],
+    total_output: int,
+    system_prompt: Optional[str],
+    model: Optional[str],
+    temperature: float,
+) -> Optional[List[str]]:
+    """
+    Send numbered prompts as one request and parse the JSON array answer.
+    
+    Returns:
+        One answer per prompt, or None if the reply isn't a JSON array of
+        the right length (the caller then sends the prompts separately)
+    """
+    numbered = "\n".join(f"{i}. {prompt}" for i, prompt in enumerate(prompts, 1))
+    packed_prompt = (
+        f"Answer each of the following {len(prompts)} numbered requests independently.\n\n"
+        f"{numbered}\n\n"
+        f"Respond with ONLY a JSON array of {len(prompts)} strings, one answer per "
+        f"request in the same order. No other text."
+    )
+    
+    # Room for the array's quotes, commas and brackets
+    max_tokens = total_output + 8 * len(prompts) + 16
+    response = call_llm(
+        packed_prompt,
+        system_prompt=system_prompt,
+        model=model,
+        temperature=temperature,
+        max_tokens=max_tokens,
+    )
+    
+    text = response.strip()
+    start, end = text.find("["), text.rfind("]")
+    if start == -1 or end < start:
+        return None
+    try:
+        answers = json.loads(text[start:end + 1])
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(answers, list) or len(answers) != len(prompts):
+        return None
+    return [answer if isinstance(answer, str) else json.dumps(answer) for answer in answers]
+
+
+def stream_llm(
+    prompt: str,
+    system_prompt: Optional[str] = None,
+    model: Optional[str] = None,
+    temperature: float = 0.7,
+    max_tokens: Optional[int] = None,
+) -> Iterator[str]:
+    """
+    Call the configured LLM and yield the response text as it is generated.
+    
+    Lets callers start working on partial output instead of waiting for the
+    whole completion. Closing the iterator early (``.close()`` or breaking
+    out of a for loop) closes the underlying stream, which stops generation
+    for providers that support cancellation. Streamed calls are not cached.
+    
+    Args:
+        prompt: The user prompt/question
+        system_prompt: Optional system prompt to set context
+        model: Override the default model from config
+        temperature: Sampling temperature (0.0 = deterministic, 1.0 = creative)
+        max_tokens: Maximum tokens in response (uses MAX_TOKENS_PER_REQUEST from config if not set)
+    
+    Yields:
+        Chunks of response text
+    
+    Raises:
+        TokenLimitExceeded: If max_tokens exceeds configured limit
+        Exception: For LLM errors
+    """
+    provider, model, max_tokens = _resolve_request(model, max_tokens)
+    messages = _build_messages(prompt, system_prompt)
+    
+    try:
+        llm = _get_client(provider, model, temperature, max_tokens)
+        stream = llm.stream(messages, **_request_options(provider, system_prompt))
+    except Exception as e:
+        raise Exception(f"LLM call failed: {str(e)}")
+    
+    try:
+        for chunk in stream:
+            if chunk.content:
+                yield chunk.content
+    except Exception as e:
+        raise Exception(f"LLM call failed: {str(e)}")
+    finally:
+        stream.close()
+
+
+def first_json_text(chunks: Iterable[str]) -> str:
+    """
+    Consume streamed text until the first top-level JSON object is complete.
+    
+    Anything the model writes after the closing brace (explanations, notes,
+    a closing code fence) is never generated: the stream is closed as soon
+    as the object ends. If no complete object is seen, the full text is
+    returned unchanged so callers can report it. ``//`` comments inside the
+    object are skipped, so a brace in a comment doesn't end the scan.
+    
+    Args:
+        chunks: Text chunks, e.g. from stream_llm()
+    
+    Returns:
+        The first JSON object's text, from its opening to its closing brace
+    """
+    seen = []     # Everything received, for the fallback
+    parts = []    # Text of the object being scanned
+    depth = 0
+    in_string = False
+    escaped = False
+    in_comment = False
+    slash = False   # Previous character was a '/' outside a string
+    
+    try:
+        for chunk in chunks:
+            seen.append(chunk)
+            start = 0 if depth else None
+            for i, ch in enumerate(chunk):
+                if in_string:
+                    if escaped:
+                        escaped = False
+                    elif ch == '\\':
+                        escaped = True
+                    elif ch == '"':
+                        in_string = False
+                elif in_comment:
+                    if ch == '\n':
+                        in_comment = False
+                elif ch == '{':
+                    if depth == 0:
+                        start = i
+                    depth += 1
+                    slash = False
+                elif depth == 0:
+                    continue
+                elif ch == '/':
+                    in_comment = slash
+                    slash = not slash
+                else:
+                    slash = False
+                    if ch == '"':
+                        in_string = True
+                    elif ch == '}':
+                        depth -= 1
+                        if depth == 0:
+                            parts.append(chunk[start:i + 1])
+                            return ''.join(parts)
+            if start is not None:
+                parts.append(chunk[start:])
+    finally:
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+    
+    return ''.join(seen)
+
+
+def call_llm_candidates(
+    prompt: str,
+    num_candidates: int,
+    system_prompt: Optional[str] = None,
+    model: Optional[str] = None,
+    temperature: float = 0.7,
+    max_tokens: Optional[int] = None,
+) -> List[str]:
+    """
+    Call the configured LLM once and return several independent completions.
+    
+    OpenAI returns all candidates from a single request (``n`` parameter), so
+    the shared prompt is only sent and processed once. Other providers are
+    sampled in a loop with the same client and messages, which still lets the
+    provider reuse its cache for the identical system prompt prefix.
+    
+    Args:
+        prompt: The user prompt/question
+        num_candidates: Number of completions to return
+        system_prompt: Optional system prompt to set context
+        model: Override the default model from config
+        temperature: Sampling temperature (0.0 = deterministic, 1.0 = creative)
+        max_tokens: Maximum tokens per completion (uses MAX_TOKENS_PER_REQUEST from config if not set)
+    
+    Returns:
+        List of ``num_candidates`` response strings
+    
+    Raises:
+        TokenLimitExceeded: If the combined max_tokens exceeds configured limit
+        ValueError: If num_candidates is less than 1
+        Exception: For other LLM errors
+    """
+    if num_candidates < 1:
+        raise ValueError(f"num_candidates must be at least 1, got {num_candidates}")
+    
+    # Every candidate can use up to max_tokens, so budget for all of them
+    provider, model, max_tokens = _resolve_request(model, max_tokens, num_completions=num_candidates)
+    messages = _build_messages(prompt, system_prompt)
+    
+    try:
+        if provider == "openai":
+            # One request, n completions
+            llm = _get_client(provider, model, temperature, max_tokens, n=num_candidates)
+            result = llm.generate([messages], **_request_options(provider, system_prompt))
+            return [generation.text for generation in result.generations[0]]
+        
+        llm = _get_client(provider, model, temperature, max_tokens)
+        options = _request_options(provider, system_prompt)
+        return [llm.invoke(messages, **options).content for _ in range(num_candidates)]
+    except Exception as e:
+        raise Exception(f"LLM call failed: {str(e)}")
+
+
+def _resolve_request(
+    model: Optional[str],
+    max_tokens: Optional[int],
+    num_completions: int = 1,
+) -> Tuple[str, str, int]:
+    """
+    Apply config defaults and the token limit for one request.
+    
+    Args:
+        model: Requested model, or None for the configured one
+        max_tokens: Requested max tokens per completion, or None for the default
+        num_completions: Completions the request will produce
+    
+    Returns:
+        Tuple (provider, model, max_tokens)
+    
+    Raises:
+        TokenLimitExceeded: If the request could exceed the daily token limit
+    """
+    config = cfg.get_config()
+    
+    # Determine max tokens (int so it makes a stable client cache key)
     if max_tokens is None:
-        max_tokens = cfg.MAX_TOKENS_PER_REQUEST
+        max_tokens = config.max_tokens_per_request
+    max_tokens = int(max_tokens)
     
     # Check token limit
-    if max_tokens > cfg.MAX_TOKENS_PER_DAY:
+    if max_tokens * num_completions > config.max_tokens_per_day:
+        if num_completions == 1:
+            requested = f"{max_tokens}"
+        else:
+            requested = f"{num_completions} x {max_tokens}"
         raise TokenLimitExceeded(
-            f"Requested {max_tokens} tokens exceeds daily limit of {cfg.MAX_TOKENS_PER_DAY}"
+            f"Requested {requested} tokens exceeds daily limit of {config.max_tokens_per_day}"
         )
     
     # Determine provider and model
@@ -67,61 +514,190 @@ def call_llm(
     if model is None:
         model = cfg.get_active_model()
     
-    # Build messages
+    return provider, model, max_tokens
+
+
+def _cache_key(
+    provider: str,
+    model: str,
+    temperature: float,
+    max_tokens: int,
+    system_prompt: Optional[str],
+    prompt: str,
+    deterministic: bool,
+) -> Optional[str]:
+    """
+    Return the response cache key for a request, or None if it shouldn't be cached.
+    
+    Only low-temperature calls are cached by default: at higher temperatures
+    callers usually want a fresh sample, unless they pass deterministic=True.
+    """
+    if not cfg.get_config().llm_cache:
+        return None
+    if temperature > CACHE_MAX_TEMPERATURE and not deterministic:
+        return None
+    return llm_cache.make_key(provider, model, temperature, max_tokens, system_prompt, prompt)
+
+
+def _request_options(provider: str, system_prompt: Optional[str]) -> dict:
+    """
+    Per-request options that let the provider reuse a cached prompt prefix.
+    
+    OpenAI caches identical prefixes of 1024+ tokens automatically; a
+    prompt_cache_key derived from the system prompt routes repeated calls
+    to the same cache. Gemini 2.5 models cache repeated prefixes implicitly,
+    so nothing is sent for them.
+    """
+    if provider != "openai" or not system_prompt or len(system_prompt) < PROMPT_CACHE_MIN_CHARS:
+        return {}
+    return {"extra_body": {"prompt_cache_key": _prompt_cache_key(system_prompt)}}
+
+
+@functools.lru_cache(maxsize=32)
+def _prompt_cache_key(system_prompt: str) -> str:
+    """Stable cache key for a system prompt (hashed once per distinct prompt)."""
+    return hashlib.sha1(system_prompt.encode("utf-8")).hexdigest()
+
+
+def _build_messages(prompt: str, system_prompt: Optional[str]) -> list:
+    """Build the chat message list for a prompt and optional system prompt."""
     messages = []
     if system_prompt:
         messages.append(SystemMessage(content=system_prompt))
     messages.append(HumanMessage(content=prompt))
+    return messages
+
+
+class ChatProvider(Protocol):
+    """A provider the client can build langchain chat models for."""
     
+    # Config field holding the API key, or None if no key is needed
+    needs_key: Optional[str]
+    
+    def build(self, model: str, temperature: float, max_tokens: int, api_key: Optional[str], n: int = 1):
+        """Instantiate a chat model for one (model, settings) combination."""
+        ...
+
+
+# Provider SDKs are imported on first use so only the configured one is loaded
+# (import caches the module in sys.modules, so later calls are a dict lookup)
+
+def _import_ollama():
+    from langchain_community.chat_models import ChatOllama
+    return ChatOllama
+
+
+def _import_openai():
     try:
-        # Route to appropriate provider
-        if provider == "ollama":
-            llm = ChatOllama(
-                model=model,
-                temperature=temperature,
-            )
-            response = llm.invoke(messages)
-            return response.content
-        
-        elif provider == "google":
-            if not GOOGLE_AVAILABLE:
-                raise ImportError("langchain-google-genai not installed. Run: pip install langchain-google-genai")
-            if not cfg.GOOGLE_API_KEY:
-                raise ValueError("GOOGLE_API_KEY not set in .env")
-            
-            llm = ChatGoogleGenerativeAI(
-                model=model,
-                temperature=temperature,
-                max_output_tokens=max_tokens,
-                google_api_key=cfg.GOOGLE_API_KEY,
-            )
-            response = llm.invoke(messages)
-            return response.content
-        
-        elif provider == "openai":
-            if not OPENAI_AVAILABLE:
-                raise ImportError("langchain-openai not installed. Run: pip install langchain-openai")
-            if not cfg.OPENAI_API_KEY:
-                raise ValueError("OPENAI_API_KEY not set in .env")
-            
-            llm = ChatOpenAI(
-                model=model,
-                temperature=temperature,
-                max_tokens=max_tokens,
-                api_key=cfg.OPENAI_API_KEY,
-            )
-            response = llm.invoke(messages)
-            return response.content
-        
-        elif provider == "anthropic":
-            # TODO: Add Anthropic support
-            raise NotImplementedError("Anthropic support coming soon")
-        
-        else:
-            raise ValueError(f"Unknown provider: {provider}")
+        from langchain_openai import ChatOpenAI
+    except ImportError:
+        raise ImportError("langchain-openai not installed. Run: pip install langchain-openai")
+    return ChatOpenAI
+
+
+def _import_google():
+    try:
+        from langchain_google_genai import ChatGoogleGenerativeAI
+    except ImportError:
+        raise ImportError("langchain-google-genai not installed. Run: pip install langchain-google-genai")
+    return ChatGoogleGenerativeAI
+
+
+class _OllamaAdapter:
+    needs_key = None
     
-    except Exception as e:
-        raise Exception(f"LLM call failed: {str(e)}")
+    def build(self, model, temperature, max_tokens, api_key, n=1):
+        ChatOllama = _import_ollama()
+        return ChatOllama(
+            model=model,
+            temperature=temperature,
+        )
+
+
+class _GoogleAdapter:
+    needs_key = "google_api_key"
+    
+    def build(self, model, temperature, max_tokens, api_key, n=1):
+        ChatGoogleGenerativeAI = _import_google()
+        return ChatGoogleGenerativeAI(
+            model=model,
+            temperature=temperature,
+            max_output_tokens=max_tokens,
+            google_api_key=api_key,
+        )
+
+
+class _OpenAIAdapter:
+    needs_key = "openai_api_key"
+    
+    def build(self, model, temperature, max_tokens, api_key, n=1):
+        ChatOpenAI = _import_openai()
+        return ChatOpenAI(
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            api_key=api_key,
+            n=n,
+        )
+
+
+class _AnthropicAdapter:
+    needs_key = None  # "anthropic_api_key" once supported
+    
+    def build(self, model, temperature, max_tokens, api_key, n=1):
+        # TODO: Add Anthropic support
+        raise NotImplementedError("Anthropic support coming soon")
+
+
+PROVIDERS = {
+    "ollama": _OllamaAdapter(),
+    "google": _GoogleAdapter(),
+    "openai": _OpenAIAdapter(),
+    "anthropic": _AnthropicAdapter(),
+}
+
+
+def _check_key(adapter: ChatProvider) -> Optional[str]:
+    """
+    Return the adapter's API key from config.
+    
+    Raises:
+        ValueError: If the provider needs a key and none is set
+    """
+    if adapter.needs_key is None:
+        return None
+    api_key = getattr(cfg.get_config(), adapter.needs_key)
+    if not api_key:
+        raise ValueError(f"{adapter.needs_key.upper()} not set in .env")
+    return api_key
+
+
+@functools.lru_cache(maxsize=16)
+def _get_client(provider: str, model: str, temperature: float, max_tokens: int, n: int = 1):
+    """
+    Get the langchain chat model for a provider, reusing a cached instance.
+    
+    Clients are memoized per (provider, model, temperature, max_tokens, n) so
+    repeated calls skip SDK setup, the key check, and reuse the underlying
+    HTTP connection pool. Call _get_client.cache_clear() to drop them (e.g.
+    in tests or after changing API keys).
+    
+    Args:
+        provider: A key of PROVIDERS
+        model: Model name
+        temperature: Sampling temperature
+        max_tokens: Maximum tokens in response
+        n: Number of completions per request (OpenAI only)
+    
+    Returns:
+        A langchain chat model instance
+    """
+    adapter = PROVIDERS.get(provider)
+    if adapter is None:
+        raise ValueError(f"Unknown provider: {provider}")
+    
+    api_key = _check_key(adapter)
+    return adapter.build(model, temperature, max_tokens, api_key, n=n)
 
 
 def test_connection() -> bool:
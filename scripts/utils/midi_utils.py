@@ -2,21 +2,91 @@
 Shared MIDI utility functions for reading, writing, and processing MIDI files.
 """
 
+import functools
+import heapq
+import numbers
+import operator
+import struct
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from mido import MidiFile, MidiTrack, Message, MetaMessage
+from typing import List, NamedTuple, Optional
+import numpy as np
+from mido import MidiFile
 
+try:
+    import symusic
+    SYMUSIC_AVAILABLE = True
+except ImportError:
+    SYMUSIC_AVAILABLE = False
 
+# Prompt templates for the MIDI scripts
+_PROMPT_DIR = Path(__file__).resolve().parent.parent.parent / "prompts" / "midi"
+
+# Event type codes for the vectorized mido fallback
+_OTHER, _NOTE_ON, _NOTE_OFF = 0, 1, 2
+
+# Order of extract_melody_data() notes: by start, then pitch (then duration,
+# so the result doesn't depend on how a backend splits tracks or channels)
+_NOTE_ORDER = operator.itemgetter("start_time", "pitch", "duration")
+
+# Resolution of files written by create_midi_from_json (mido's default)
+TICKS_PER_BEAT = 480
+
+# MIDI lyrics are latin-1, so map Unicode punctuation to ASCII equivalents
+# (one str.translate pass per word; anything left over is dropped on encode)
+LYRIC_TRANSLATE = str.maketrans({
+    '\u2019': "'",    # Right single quote (')
+    '\u2018': "'",    # Left single quote (')
+    '\u201c': '"',    # Left double quote (")
+    '\u201d': '"',    # Right double quote (")
+    '\u201e': '"',    # Double low-9 quote („)
+    '\u201f': '"',    # Double high-reversed-9 quote (‟)
+    '\u2014': '-',    # Em dash (—)
+    '\u2013': '-',    # En dash (–)
+    '\u2012': '-',    # Figure dash (‒)
+    '\u2015': '-',    # Horizontal bar (―)
+    '\u2026': '...',  # Ellipsis (…)
+    '\u2022': '*',    # Bullet (•)
+    '\u00a0': ' ',    # Non-breaking space
+    '\u2002': ' ',    # En space
+    '\u2003': ' ',    # Em space
+    '\u2009': ' ',    # Thin space
+    '\u00ab': '"',    # Left guillemet («)
+    '\u00bb': '"',    # Right guillemet (»)
+    '\u2032': "'",    # Prime (′)
+    '\u2033': '"',    # Double prime (″)
+    '\u02bc': "'",    # Modifier letter apostrophe (ʼ)
+})
+
+
+class LyricNote(NamedTuple):
+    """
+    One lyric word placed on a note (an entry of a word mapping).
+    
+    A tuple subclass, so code that unpacks (word, pitch, start_time, duration)
+    or indexes it keeps working, with no per-instance dict.
+    """
+    text: str
+    pitch: int
+    start: float      # seconds
+    duration: float   # seconds
+
+
+@functools.lru_cache(maxsize=32)
 def load_prompt(prompt_name: str) -> str:
     """
     Load a prompt template from the prompts directory.
     
+    Templates are static at runtime, so each is read from disk once; call
+    _reload_prompts() after editing them in a running process.
+    
     Args:
         prompt_name: Name of the prompt file (without .md extension)
     
     Returns:
         Prompt text content
     """
-    prompt_path = Path(__file__).parent.parent.parent / "prompts" / "midi" / f"{prompt_name}.md"
+    prompt_path = _PROMPT_DIR / f"{prompt_name}.md"
     
     if not prompt_path.exists():
         raise FileNotFoundError(f"Prompt file not found: {prompt_path}")
@@ -24,51 +94,164 @@ def load_prompt(prompt_name: str) -> str:
     return prompt_path.read_text()
 
 
+def _reload_prompts() -> None:
+    """Drop cached prompt templates so the next load_prompt() rereads them."""
+    load_prompt.cache_clear()
+
+
 def extract_melody_data(midi_file_path: Path) -> dict:
     """
     Extract melody information from a MIDI file.
     
+    Both backends (symusic, or mido when symusic isn't installed) give the
+    same result: every track's time starts at 0, a note_off closes the
+    earliest open note_on of the same track, channel and pitch, and notes
+    are sorted by start time, then pitch. The tempo is the earliest
+    set_tempo in the file (default 120 BPM).
+    
     Args:
         midi_file_path: Path to the MIDI file
     
     Returns:
         Dictionary with tempo, notes list, and ticks_per_beat
     """
-    midi = MidiFile(str(midi_file_path))
+    if SYMUSIC_AVAILABLE:
+        return _extract_melody_data_symusic(midi_file_path)
+    return _extract_melody_data_mido(midi_file_path)
+
+
+def extract_melody_data_batch(paths: List[Path], max_workers: Optional[int] = None) -> List[dict]:
+    """
+    Extract melody information from many MIDI files in parallel.
+    
+    With symusic the parsing runs in its C++ core, so a thread pool is used
+    and nothing has to be pickled. The pure-Python mido fallback holds the
+    GIL, so it runs in a process pool instead; files are sent in chunks of
+    16 because per-task IPC dominates for small MIDI files.
+    
+    Args:
+        paths: MIDI files to read
+        max_workers: Pool size (defaults to the executor's own default)
+    
+    Returns:
+        One extract_melody_data() result per path, in the same order
+    """
+    executor_class = ThreadPoolExecutor if SYMUSIC_AVAILABLE else ProcessPoolExecutor
+    with executor_class(max_workers=max_workers) as executor:
+        return list(executor.map(extract_melody_data, paths, chunksize=16))
+
+
+def _extract_melody_data_symusic(midi_file_path: Path) -> dict:
+    """extract_melody_data() using symusic's C++ parser (notes come pre-paired)."""
+    score = symusic.Score.from_file(str(midi_file_path))
+    ticks_per_beat = score.tpq
     
     # Extract tempo (default 120 BPM)
     tempo = 120
-    for track in midi.tracks:
-        for msg in track:
-            if msg.type == 'set_tempo':
-                tempo = int(60_000_000 / msg.tempo)
-                break
+    if len(score.tempos) > 0:
+        tempo = int(60_000_000 / score.tempos[0].mspq)
     
-    # Extract notes
     notes = []
-    current_time = 0
+    for track in score.tracks:
+        for n in track.notes:
+            notes.append({
+                "pitch": n.pitch,
+                "duration": round(n.duration / ticks_per_beat, 2),
+                "start_time": n.time / ticks_per_beat
+            })
+    notes.sort(key=_NOTE_ORDER)
+    
+    return {
+        "tempo": tempo,
+        "notes": notes,
+        "ticks_per_beat": ticks_per_beat
+    }
+
+
+def _extract_melody_data_mido(midi_file_path: Path) -> dict:
+    """
+    extract_melody_data() fallback using mido when symusic isn't installed.
+    
+    Walks the messages once to collect event columns, then pairs note_on /
+    note_off events with array operations instead of a per-note dict loop.
+    Pairing and timing follow symusic (see extract_melody_data()).
+    """
+    midi = MidiFile(str(midi_file_path))
     ticks_per_beat = midi.ticks_per_beat
     
-    for track in midi.tracks:
-        note_on_times = {}
-        
+    # Collect event columns (one entry per note message, all tracks) and the
+    # earliest tempo; each track's time starts at 0
+    types, pitches, times, channels, track_ids = [], [], [], [], []
+    tempo, tempo_time = 120, None
+    for track_idx, track in enumerate(midi.tracks):
+        now = 0
         for msg in track:
-            current_time += msg.time
-            
-            if msg.type == 'note_on' and msg.velocity > 0:
-                note_on_times[msg.note] = current_time
-            elif msg.type == 'note_off' or (msg.type == 'note_on' and msg.velocity == 0):
-                if msg.note in note_on_times:
-                    start_time = note_on_times[msg.note]
-                    duration_ticks = current_time - start_time
-                    duration_beats = duration_ticks / ticks_per_beat
-                    
-                    notes.append({
-                        "pitch": msg.note,
-                        "duration": round(duration_beats, 2),
-                        "start_time": start_time / ticks_per_beat
-                    })
-                    del note_on_times[msg.note]
+            now += msg.time
+            if msg.type == 'note_on':
+                types.append(_NOTE_ON if msg.velocity > 0 else _NOTE_OFF)
+            elif msg.type == 'note_off':
+                types.append(_NOTE_OFF)
+            else:
+                if msg.type == 'set_tempo' and (tempo_time is None or now < tempo_time):
+                    tempo, tempo_time = int(60_000_000 / msg.tempo), now
+                continue
+            pitches.append(msg.note)
+            times.append(now)
+            channels.append(msg.channel)
+            track_ids.append(track_idx)
+    
+    if not times:
+        return {"tempo": tempo, "notes": [], "ticks_per_beat": ticks_per_beat}
+    
+    on = np.asarray(types, dtype=np.int8) == _NOTE_ON
+    pitches = np.asarray(pitches, dtype=np.int16)
+    abs_time = np.asarray(times, dtype=np.int64)
+    
+    # Group events by (track, channel, pitch), keeping message order within
+    # a group
+    order = np.lexsort((np.arange(len(on)), pitches, channels, track_ids))
+    on = on[order]
+    key = (np.asarray(track_ids, dtype=np.int64)[order] << 16) | (np.asarray(channels, dtype=np.int64)[order] << 8) | pitches[order]
+    group_start = np.r_[True, key[1:] != key[:-1]]
+    group = np.cumsum(group_start) - 1
+    starts = np.flatnonzero(group_start)
+    
+    # Open notes per group: a running +1/-1 count, except that an off with
+    # nothing open is ignored. Those offs are where the count would drop to
+    # a new minimum below zero, found with a running minimum per group (the
+    # group offset keeps each group's minimum from seeing earlier groups)
+    step = np.where(on, 1, -1)
+    count = np.cumsum(step)
+    count -= (count - step)[starts][group]
+    big = 2 * len(step) + 2
+    low = np.minimum(np.minimum.accumulate(count - group * big) + group * big, 0)
+    low_before = np.r_[0, low[:-1]]
+    low_before[starts] = 0
+    valid_off = ~on & (low == low_before)
+    
+    # First in, first out: the k-th valid off of a group closes its k-th on
+    # (notes still open at the end are dropped)
+    def rank(mask):
+        seen = np.cumsum(mask)
+        return seen - (seen - mask)[starts][group] - 1
+    
+    rank_base = len(step) + 1
+    on_keys = (group * rank_base + rank(on))[on]
+    off_keys = (group * rank_base + rank(valid_off))[valid_off]
+    on_idx = order[np.flatnonzero(on)[np.searchsorted(on_keys, off_keys)]]
+    off_idx = order[np.flatnonzero(valid_off)]
+    
+    durations = (abs_time[off_idx] - abs_time[on_idx]) / ticks_per_beat
+    start_times = abs_time[on_idx] / ticks_per_beat
+    
+    # Python round() rather than np.round() so half-way cases round exactly as before
+    notes = [
+        {"pitch": pitch, "duration": round(duration, 2), "start_time": start_time}
+        for pitch, duration, start_time in zip(
+            pitches[off_idx].tolist(), durations.tolist(), start_times.tolist()
+        )
+    ]
+    notes.sort(key=_NOTE_ORDER)
     
     return {
         "tempo": tempo,
@@ -77,6 +260,62 @@ def extract_melody_data(midi_file_path: Path) -> dict:
     }
 
 
+def extract_melody_summary(midi_file_path: Path) -> dict:
+    """
+    Extract only the tempo and note count from a MIDI file.
+    
+    Cheaper than extract_melody_data() when a caller just needs scalar
+    context (e.g. for an LLM prompt): notes are counted with the same
+    note_on/note_off pairing rules, but no per-note dicts are built.
+    
+    Args:
+        midi_file_path: Path to the MIDI file
+    
+    Returns:
+        Dictionary with tempo and num_notes
+    """
+    if SYMUSIC_AVAILABLE:
+        score = symusic.Score.from_file(str(midi_file_path))
+        tempo = 120
+        if len(score.tempos) > 0:
+            tempo = int(60_000_000 / score.tempos[0].mspq)
+        return {
+            "tempo": tempo,
+            "num_notes": sum(track.note_num() for track in score.tracks),
+        }
+    
+    midi = MidiFile(str(midi_file_path))
+    
+    # Same rules as extract_melody_data: the earliest set_tempo wins (each
+    # track's time starts at 0), and an off closes one open note of its
+    # channel and pitch
+    tempo, tempo_time = 120, None
+    num_notes = 0
+    
+    for track in midi.tracks:
+        now = 0
+        sounding = {}
+        
+        for msg in track:
+            now += msg.time
+            if msg.type == 'set_tempo':
+                if tempo_time is None or now < tempo_time:
+                    tempo, tempo_time = int(60_000_000 / msg.tempo), now
+            elif msg.type == 'note_on' and msg.velocity > 0:
+                key = (msg.channel, msg.note)
+                sounding[key] = sounding.get(key, 0) + 1
+            elif msg.type == 'note_off' or msg.type == 'note_on':
+                key = (msg.channel, msg.note)
+                if sounding.get(key):
+                    sounding[key] -= 1
+                    num_notes += 1
+    
+    return {
+        "tempo": tempo,
+        "num_notes": num_notes,
+    }
+
+
 def create_midi_from_json(melody_data: dict, output_path: Path, velocity: int = 64, word_mapping: list = None) -> None:
     """
     Convert JSON melody data to MIDI file, optionally with embedded lyrics.
@@ -88,25 +327,19 @@ def create_midi_from_json(melody_data: dict, output_path: Path, velocity: int =
         word_mapping: Optional list of (word, pitch, start_time_seconds, duration_seconds) tuples
                      for embedding lyrics as MIDI meta-events
     """
-    midi = MidiFile()
-    track = MidiTrack()
-    midi.tracks.append(track)
-    
     # Set tempo (convert BPM to microseconds per beat)
     tempo = melody_data.get("tempo", 120)
     microseconds_per_beat = int(60_000_000 / tempo)
-    track.append(MetaMessage('set_tempo', tempo=microseconds_per_beat))
     
-    # Set time signature (4/4)
-    track.append(MetaMessage('time_signature', numerator=4, denominator=4))
+    ticks_per_beat = TICKS_PER_BEAT
     
-    ticks_per_beat = midi.ticks_per_beat
+    # Note events as (absolute_tick, status, pitch, velocity)
+    events = []
+    lyrics_events = []
+    current_tick = 0
     
-    # If we have lyrics, build events with absolute times then sort
+    # If we have lyrics, rests just advance time and lyrics are merged in by tick
     if word_mapping:
-        events = []
-        current_tick = 0
-        
         # Add notes from melody_data
         for note_data in melody_data.get("notes", []):
             pitch = note_data.get("pitch", 60)
@@ -118,9 +351,9 @@ def create_midi_from_json(melody_data: dict, output_path: Path, velocity: int =
                 current_tick += duration_ticks
             else:
                 # Note on
-                events.append((current_tick, Message('note_on', note=pitch, velocity=velocity)))
+                events.append((current_tick, 0x90, pitch, velocity))
                 # Note off
-                events.append((current_tick + duration_ticks, Message('note_off', note=pitch, velocity=velocity)))
+                events.append((current_tick + duration_ticks, 0x80, pitch, velocity))
                 current_tick += duration_ticks
         
         # Add lyrics from word_mapping
@@ -131,43 +364,8 @@ def create_midi_from_json(melody_data: dict, output_path: Path, velocity: int =
             
             # Add lyric event at the start of the note
             # MIDI uses latin-1, so replace Unicode punctuation with ASCII equivalents
-            clean_word = (word
-                .replace('\u2019', "'")   # Right single quote (')
-                .replace('\u2018', "'")   # Left single quote (')
-                .replace('\u201c', '"')   # Left double quote (")
-                .replace('\u201d', '"')   # Right double quote (")
-                .replace('\u201e', '"')   # Double low-9 quote („)
-                .replace('\u201f', '"')   # Double high-reversed-9 quote (‟)
-                .replace('\u2014', '-')   # Em dash (—)
-                .replace('\u2013', '-')   # En dash (–)
-                .replace('\u2012', '-')   # Figure dash (‒)
-                .replace('\u2015', '-')   # Horizontal bar (―)
-                .replace('\u2026', '...') # Ellipsis (…)
-                .replace('\u2022', '*')   # Bullet (•)
-                .replace('\u00a0', ' ')   # Non-breaking space
-                .replace('\u2002', ' ')   # En space
-                .replace('\u2003', ' ')   # Em space
-                .replace('\u2009', ' ')   # Thin space
-                .replace('\u00ab', '"')   # Left guillemet («)
-                .replace('\u00bb', '"')   # Right guillemet (»)
-                .replace('\u2032', "'")   # Prime (′)
-                .replace('\u2033', '"')   # Double prime (″)
-                .replace('\u02bc', "'")   # Modifier letter apostrophe (ʼ)
-            )
-            # Remove any remaining non-latin-1 characters
-            clean_word = clean_word.encode('latin-1', errors='ignore').decode('latin-1')
-            events.append((start_tick, MetaMessage('lyrics', text=clean_word)))
-        
-        # Sort all events by absolute time
-        events.sort(key=lambda x: x[0])
-        
-        # Convert to delta times and append to track
-        last_tick = 0
-        for abs_tick, msg in events:
-            delta_tick = abs_tick - last_tick
-            msg.time = delta_tick
-            track.append(msg)
-            last_tick = abs_tick
+            clean_word = word.translate(LYRIC_TRANSLATE).encode('latin-1', errors='ignore').decode('latin-1')
+            lyrics_events.append((start_tick, clean_word))
     else:
         # Original code path (no lyrics)
         for note_data in melody_data.get("notes", []):
@@ -178,18 +376,110 @@ def create_midi_from_json(melody_data: dict, output_path: Path, velocity: int =
             ticks = int(duration * ticks_per_beat)
             
             if pitch == 0:
-                # Rest - just wait
-                track.append(Message('note_on', note=60, velocity=0, time=ticks))
+                # Rest - a silent note_on that just waits
+                current_tick += ticks
+                events.append((current_tick, 0x90, 60, 0))
             else:
                 # Note on
-                track.append(Message('note_on', note=pitch, velocity=velocity, time=0))
+                events.append((current_tick, 0x90, pitch, velocity))
                 # Note off
-                track.append(Message('note_off', note=pitch, velocity=velocity, time=ticks))
-    
-    # End of track
-    track.append(MetaMessage('end_of_track'))
+                current_tick += ticks
+                events.append((current_tick, 0x80, pitch, velocity))
     
     # Save
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    midi.save(str(output_path))
+    write_midi_fast(events, ticks_per_beat, microseconds_per_beat, lyrics_events, output_path)
+
+
+def write_midi_fast(events: list, ticks_per_beat: int, tempo_uspb: int, lyrics_events: list, out_path: Path) -> None:
+    """
+    Write a single-track 4/4 MIDI file straight from event tuples.
+    
+    Produces the same bytes mido's MidiFile.save() would for the equivalent
+    track (type 1 header, running status, end_of_track), without building a
+    Message object per event.
+    
+    Args:
+        events: (absolute_tick, status, pitch, velocity) channel events in
+                playback order; status is 0x90 (note_on) or 0x80 (note_off)
+        ticks_per_beat: MIDI resolution
+        tempo_uspb: Tempo in microseconds per beat
+        lyrics_events: (absolute_tick, text) lyric events; text must be latin-1.
+                       Merged with events by tick, notes first on ties
+        out_path: Where to save the MIDI file
+    
+    Raises:
+        ValueError: If a data byte, the tempo, or a delta time is out of range
+    """
+    if not 0 <= tempo_uspb <= 0xFFFFFF:
+        raise ValueError(f"tempo must be in range 0..16777215, got {tempo_uspb}")
+    
+    if lyrics_events:
+        # Notes come out in tick order and lyrics usually do too, so a linear
+        # merge is enough; either way notes stay ahead of lyrics on ties
+        if _ticks_sorted(events) and _ticks_sorted(lyrics_events):
+            events = list(heapq.merge(events, lyrics_events, key=operator.itemgetter(0)))
+        else:
+            events = sorted(events + lyrics_events, key=operator.itemgetter(0))
+    
+    buf = bytearray()
+    # Tempo and 4/4 time signature (24 clocks per click, 8 32nds per beat)
+    buf += b'\x00\xff\x51\x03' + tempo_uspb.to_bytes(3, 'big')
+    buf += b'\x00\xff\x58\x04\x04\x02\x18\x08'
+    
+    last_tick = 0
+    running_status = None
+    for event in events:
+        abs_tick = event[0]
+        delta = abs_tick - last_tick
+        if delta < 0:
+            raise ValueError('message time must be non-negative in MIDI file')
+        buf += _vlq(delta)
+        last_tick = abs_tick
+        
+        if len(event) == 2:
+            # Lyric meta event
+            text = event[1].encode('latin-1')
+            buf += b'\xff\x05' + _vlq(len(text)) + text
+            running_status = None
+        else:
+            _, status, pitch, velocity = event
+            _check_data_byte('note', pitch)
+            _check_data_byte('velocity', velocity)
+            if status != running_status:
+                buf.append(status)
+                running_status = status
+            buf.append(pitch)
+            buf.append(velocity)
+    
+    # End of track
+    buf += b'\x00\xff\x2f\x00'
+    
+    with open(out_path, 'wb') as out:
+        out.write(b'MThd\x00\x00\x00\x06\x00\x01\x00\x01' + struct.pack('>H', ticks_per_beat))
+        out.write(b'MTrk' + struct.pack('>I', len(buf)))
+        out.write(buf)
+
+
+def _ticks_sorted(events: list) -> bool:
+    """Return True if events are in non-decreasing tick order."""
+    return all(a[0] <= b[0] for a, b in zip(events, events[1:]))
+
+
+def _vlq(value: int) -> bytes:
+    """Encode a non-negative integer as a MIDI variable-length quantity."""
+    out = bytearray([value & 0x7F])
+    value >>= 7
+    while value:
+        out.append(0x80 | (value & 0x7F))
+        value >>= 7
+    out.reverse()
+    return bytes(out)
+
 
+def _check_data_byte(name: str, value) -> None:
+    """Validate a MIDI data byte the way mido does."""
+    if not isinstance(value, numbers.Integral):
+        raise TypeError(f'{name} must be int')
+    if not 0 <= value <= 127:
+        raise ValueError(f'{name} must be in range 0..127')
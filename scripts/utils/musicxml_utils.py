@@ -3,14 +3,49 @@ MusicXML utilities for Synthaia.
 Converts MIDI data and lyrics into MusicXML format for Sinsy singing synthesis.
 """
 
+import logging
+import re
 from pathlib import Path
-from music21 import stream, note, tempo, key, meter, chord
+from xml.sax.saxutils import escape
+
+logger = logging.getLogger(__name__)
+
+# Divisions per quarter note in written MusicXML (divisible by 2, 3, 4, 5, 8, 16)
+DIVISIONS = 480
+
+# One 4/4 measure in divisions
+_MEASURE = 4 * DIVISIONS
+
+# (step, alter, octave) for every MIDI pitch, spelled with sharps
+_STEPS = 'C C D D E F F G G A A B'.split()
+_ALTERS = (0, 1, 0, 1, 0, 0, 1, 0, 1, 0, 1, 0)
+_PITCH_TABLE = tuple((_STEPS[p % 12], _ALTERS[p % 12], p // 12 - 1) for p in range(128))
+
+# Written note values, longest first: (divisions, type, dots)
+_NOTE_VALUES = (
+    (4 * DIVISIONS, 'whole', 0),
+    (3 * DIVISIONS, 'half', 1),
+    (2 * DIVISIONS, 'half', 0),
+    (3 * DIVISIONS // 2, 'quarter', 1),
+    (DIVISIONS, 'quarter', 0),
+    (3 * DIVISIONS // 4, 'eighth', 1),
+    (DIVISIONS // 2, 'eighth', 0),
+    (3 * DIVISIONS // 8, '16th', 1),
+    (DIVISIONS // 4, '16th', 0),
+    (DIVISIONS // 8, '32nd', 0),
+)
+
+# Position of each natural tonic on the circle of fifths (C major = 0)
+_KEY_FIFTHS = {'F': -1, 'C': 0, 'G': 1, 'D': 2, 'A': 3, 'E': 4, 'B': 5}
+
+_KEY_NAME = re.compile(r'^([A-Ga-g])([#b-]*)$')
 
 
 def create_musicxml_with_lyrics(
     vocal_data: dict,
     word_mapping: list,
     output_path: Path,
+    use_fast_xml: bool = True,
 ) -> Path:
     """
     Convert vocal MIDI data and word mapping to MusicXML with embedded lyrics.
@@ -22,6 +57,7 @@ def create_musicxml_with_lyrics(
         vocal_data: Dict with 'tempo', 'key', 'scale', 'notes' (from LLM)
         word_mapping: List of (word, pitch, start_time, duration) tuples
         output_path: Where to save the MusicXML file
+        use_fast_xml: Write the XML directly (default) instead of through music21
     
     Returns:
         Path to created MusicXML file
@@ -36,11 +72,125 @@ def create_musicxml_with_lyrics(
         word_mapping = [('Hello', 60, 0.0, 0.5), ('world', 62, 0.5, 0.5)]
         create_musicxml_with_lyrics(vocal_data, word_mapping, Path('vocals.musicxml'))
     """
-    print(f"[CREATE_MUSICXML] Starting")
-    print(f"[CREATE_MUSICXML] Tempo: {vocal_data['tempo']} BPM")
-    print(f"[CREATE_MUSICXML] Key: {vocal_data['key']} {vocal_data.get('scale', 'major')}")
-    print(f"[CREATE_MUSICXML] Words to map: {len(word_mapping)}")
-    print(f"[CREATE_MUSICXML] Output: {output_path}")
+    logger.info("[CREATE_MUSICXML] Starting: %d words -> %s", len(word_mapping), output_path)
+    logger.debug("[CREATE_MUSICXML] Tempo: %s BPM", vocal_data['tempo'])
+    logger.debug("[CREATE_MUSICXML] Key: %s %s", vocal_data['key'], vocal_data.get('scale', 'major'))
+    
+    # Ensure output directory exists
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    
+    if use_fast_xml:
+        _write_musicxml_fast(vocal_data, word_mapping, output_path)
+    else:
+        _write_musicxml_music21(vocal_data, word_mapping, output_path)
+    
+    if logger.isEnabledFor(logging.INFO):
+        file_size = output_path.stat().st_size
+        logger.info("[CREATE_MUSICXML] File written: %d bytes (%.1f KB)", file_size, file_size / 1024)
+    return output_path
+
+
+def _write_musicxml_fast(vocal_data: dict, word_mapping: list, output_path: Path) -> None:
+    """
+    Write a single-voice MusicXML part with lyrics directly as text.
+    
+    Notes crossing a barline are split and tied, and durations without a
+    single written value are split into tied standard values. Only the
+    first piece of a note carries its lyric.
+    """
+    tempo_bpm = vocal_data['tempo']
+    fifths, mode = _key_signature(vocal_data['key'])
+    
+    measures = []   # Finished measures, each a list of <note> strings
+    current = []    # Notes in the measure being filled
+    position = 0    # Divisions used in the current measure
+    
+    # Sort by start time to ensure proper order
+    word_mapping_sorted = sorted(word_mapping, key=lambda x: x[2])
+    
+    for word, pitch, start_time, duration in word_mapping_sorted:
+        # Rests (pitch 0 or None) carry no lyric
+        if not pitch:
+            pitch_xml = None
+        else:
+            try:
+                midi = int(pitch)
+            except (TypeError, ValueError):
+                continue
+            if not 0 <= midi < 128:
+                continue
+            step, alter, octave = _PITCH_TABLE[midi]
+            alter_xml = f'<alter>{alter}</alter>' if alter else ''
+            pitch_xml = f'<pitch><step>{step}</step>{alter_xml}<octave>{octave}</octave></pitch>'
+        
+        # Convert duration from seconds to divisions
+        remaining = round(_beats_to_quarter_length(duration, tempo_bpm) * DIVISIONS)
+        pieces = []
+        while remaining > 0:
+            # Fill to the barline, then into following measures
+            in_measure = min(remaining, _MEASURE - position)
+            for length, note_type, dots in _split_note_value(in_measure):
+                pieces.append((length, note_type, dots))
+            remaining -= in_measure
+            position += in_measure
+            if position == _MEASURE:
+                pieces.append(None)
+                position = 0
+        
+        # Tie consecutive pieces of the same pitched note
+        sounding = [piece for piece in pieces if piece is not None]
+        index = 0
+        for piece in pieces:
+            if piece is None:
+                measures.append(current)
+                current = []
+                continue
+            length, note_type, dots = piece
+            lyric = word if index == 0 and pitch_xml is not None else None
+            tie_start = pitch_xml is not None and index < len(sounding) - 1
+            tie_stop = pitch_xml is not None and index > 0
+            current.append(_note_xml(pitch_xml, length, note_type, dots, lyric, tie_start, tie_stop))
+            index += 1
+    
+    if current or not measures:
+        measures.append(current)
+    
+    attributes = (
+        f'<attributes><divisions>{DIVISIONS}</divisions>'
+        f'<key><fifths>{fifths}</fifths><mode>{mode}</mode></key>'
+        '<time><beats>4</beats><beat-type>4</beat-type></time>'
+        '<clef><sign>G</sign><line>2</line></clef></attributes>'
+    )
+    direction = (
+        '<direction placement="above"><direction-type><metronome>'
+        f'<beat-unit>quarter</beat-unit><per-minute>{tempo_bpm}</per-minute>'
+        f'</metronome></direction-type><sound tempo="{tempo_bpm}"/></direction>'
+    )
+    
+    parts = [
+        '<?xml version="1.0" encoding="utf-8"?>\n'
+        '<!DOCTYPE score-partwise PUBLIC "-//Recordare//DTD MusicXML 4.0 Partwise//EN" '
+        '"http://www.musicxml.org/dtds/partwise.dtd">\n'
+        '<score-partwise version="4.0">\n'
+        '<part-list><score-part id="P1"><part-name>Voice</part-name></score-part></part-list>\n'
+        '<part id="P1">\n'
+    ]
+    for number, notes in enumerate(measures, 1):
+        parts.append(f'<measure number="{number}">\n')
+        if number == 1:
+            parts.append(attributes + '\n' + direction + '\n')
+        parts.extend(notes)
+        parts.append('</measure>\n')
+    parts.append('</part>\n</score-partwise>\n')
+    
+    output_path.write_text(''.join(parts), encoding='utf-8')
+
+
+def _write_musicxml_music21(vocal_data: dict, word_mapping: list, output_path: Path) -> None:
+    """Build the score with music21 and write it as MusicXML."""
+    # music21 takes a while to import, so only load it for this fallback
+    from music21 import stream, note, tempo, key, meter
+    from music21.pitch import Pitch
     
     # Create score structure
     score = stream.Score()
@@ -73,9 +223,13 @@ def create_musicxml_with_lyrics(
             part.append(r)
             continue
         
-        # Create note
+        # Create note (table lookup skips music21's MIDI-number spelling)
         try:
-            n = note.Note(pitch)
+            if isinstance(pitch, int) and 0 <= pitch < 128:
+                step, alter, octave = _PITCH_TABLE[pitch]
+                n = note.Note(Pitch(step=step, octave=octave, accidental=alter or None))
+            else:
+                n = note.Note(pitch)
         except Exception as e:
             continue
         
@@ -91,16 +245,83 @@ def create_musicxml_with_lyrics(
     # Add part to score
     score.append(part)
     
-    # Ensure output directory exists
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    
     # Write to MusicXML
     score.write('musicxml', fp=str(output_path))
+
+
+def _split_note_value(length: int) -> list:
+    """
+    Split a duration in divisions into written note values, longest first.
     
-    file_size = output_path.stat().st_size
-    print(f"[CREATE_MUSICXML] File written: {file_size} bytes ({file_size/1024:.1f} KB)")
-    print(f"[CREATE_MUSICXML] Complete")
-    return output_path
+    Returns:
+        List of (divisions, type, dots); a remainder shorter than a 32nd is
+        returned with type None (MusicXML allows notes without a type)
+    """
+    pieces = []
+    for value, note_type, dots in _NOTE_VALUES:
+        while length >= value:
+            pieces.append((value, note_type, dots))
+            length -= value
+    if length:
+        pieces.append((length, None, 0))
+    return pieces
+
+
+def _note_xml(pitch_xml, length: int, note_type, dots: int, lyric, tie_start: bool, tie_stop: bool) -> str:
+    """Render one <note> element (pitch_xml None renders a rest)."""
+    out = ['<note>', pitch_xml if pitch_xml is not None else '<rest/>', f'<duration>{length}</duration>']
+    if tie_stop:
+        out.append('<tie type="stop"/>')
+    if tie_start:
+        out.append('<tie type="start"/>')
+    if note_type is not None:
+        out.append(f'<type>{note_type}</type>')
+        out.append('<dot/>' * dots)
+    if tie_start or tie_stop:
+        out.append('<notations>')
+        if tie_stop:
+            out.append('<tied type="stop"/>')
+        if tie_start:
+            out.append('<tied type="start"/>')
+        out.append('</notations>')
+    if lyric:
+        syllabic, text = _syllabic(lyric)
+        out.append(f'<lyric number="1"><syllabic>{syllabic}</syllabic><text>{escape(text)}</text></lyric>')
+    out.append('</note>\n')
+    return ''.join(out)
+
+
+def _syllabic(lyric: str) -> tuple:
+    """
+    Return (syllabic, text) for a lyric, following music21's hyphen rules.
+    
+    "Hel-" is a begin syllable, "-lo" an end, "-el-" a middle; the hyphens
+    are stripped from the text. Anything else is a single syllable.
+    """
+    if lyric.startswith('-'):
+        if lyric.endswith('-'):
+            return 'middle', lyric[1:-1]
+        return 'end', lyric[1:]
+    if lyric.endswith('-'):
+        return 'begin', lyric[:-1]
+    return 'single', lyric
+
+
+def _key_signature(key_name: str) -> tuple:
+    """
+    Return (fifths, mode) for a key name, following music21's convention.
+    
+    An uppercase tonic is major and a lowercase tonic is minor ('C', 'f#',
+    'Bb' or 'B-'). Unrecognised names fall back to C major.
+    """
+    match = _KEY_NAME.match(str(key_name).strip())
+    if not match:
+        return 0, 'major'
+    letter, accidentals = match.groups()
+    fifths = _KEY_FIFTHS[letter.upper()] + 7 * accidentals.count('#') - 7 * (len(accidentals) - accidentals.count('#'))
+    if letter.islower():
+        return fifths - 3, 'minor'
+    return fifths, 'major'
 
 
 def _beats_to_quarter_length(duration_seconds: float, tempo_bpm: int) -> float:
@@ -3,11 +3,17 @@ Synth V GUI Automation for macOS
 Automates importing MIDI with lyrics and rendering to WAV
 """
 
+import logging
+import shlex
 import subprocess
 import time
 from pathlib import Path
 import os
 
+from scripts.utils import cfg
+
+logger = logging.getLogger(__name__)
+
 
 def render_vocals_with_synthv(
     midi_path: Path,
@@ -18,6 +24,9 @@ def render_vocals_with_synthv(
     """
     Automate Synth V to import MIDI with lyrics and render to WAV.
     
+    Uses SYNTHV_RENDER_COMMAND when it is configured, otherwise drives the
+    Synth V GUI with AppleScript.
+    
     Args:
         midi_path: Path to MIDI file with embedded lyrics
         output_wav_path: Where to save the rendered WAV
@@ -27,102 +36,99 @@ def render_vocals_with_synthv(
     Returns:
         Path to rendered WAV file
     """
-    print(f"[SYNTHV_AUTOMATION] Starting")
-    print(f"[SYNTHV_AUTOMATION] MIDI input: {midi_path}")
-    print(f"[SYNTHV_AUTOMATION] WAV output: {output_wav_path}")
-    print(f"[SYNTHV_AUTOMATION] Voice: {voice}")
+    logger.info("[SYNTHV_AUTOMATION] Starting: %s -> %s", midi_path, output_wav_path)
+    logger.debug("[SYNTHV_AUTOMATION] Voice: %s", voice)
     
     # Ensure paths are absolute
     midi_path = midi_path.resolve()
     output_wav_path = output_wav_path.resolve()
     output_wav_path.parent.mkdir(parents=True, exist_ok=True)
     
-    # AppleScript to automate Synth V
-    applescript = f'''
+    # Remove a WAV left by an earlier run so it can't pass for this render
+    try:
+        output_wav_path.unlink()
+    except FileNotFoundError:
+        pass
+    
+    # Headless render if a command is configured
+    render_command = cfg.get_config().synthv_render_command
+    if render_command:
+        return _render_with_command(render_command, midi_path, output_wav_path, timeout)
+    
+    # AppleScript fallback: hand the MIDI to Synth V as an open-file event
+    # instead of typing its path into the import dialog. The script only
+    # starts the render; completion is detected by polling for the WAV.
+    trigger_script = f'''
     tell application "Synthesizer V Studio 2 Pro"
         activate
-        delay 2
+        open POSIX file {_applescript_string(str(midi_path))}
+    end tell
+    
+    -- Wait for import to complete
+    delay 3
+    
+    tell application "System Events"
+        -- TODO: Set voice to {voice}
+        -- This might require clicking specific UI elements
+        -- For now, assume voice is already selected
         
-        -- Import MIDI file
-        tell application "System Events"
-            -- File menu -> Import
-            keystroke "i" using {{command down}}
-            delay 1
-            
-            -- Type file path in open dialog
-            keystroke "{str(midi_path)}"
-            delay 0.5
-            keystroke "g" using {{command down, shift down}}
-            delay 0.5
-            keystroke "{str(midi_path)}"
-            delay 0.5
-            keystroke return
-            delay 3
-            
-            -- Wait for import to complete
-            delay 2
-            
-            -- TODO: Set voice to {voice}
-            -- This might require clicking specific UI elements
-            -- For now, assume voice is already selected
-            
-            -- Render to WAV
-            -- File menu -> Render
-            keystroke "r" using {{command down, shift down}}
-            delay 2
-            
-            -- Set output path in save dialog
-            keystroke "g" using {{command down, shift down}}
-            delay 0.5
-            keystroke "{str(output_wav_path.parent)}"
-            delay 0.5
-            keystroke return
-            delay 1
-            
-            -- Set filename
-            keystroke "a" using {{command down}}
-            keystroke "{output_wav_path.name}"
-            delay 0.5
-            keystroke return
-            
-            -- Wait for render to complete
-            delay 10
-        end tell
+        -- Render to WAV
+        -- File menu -> Render
+        keystroke "r" using {{command down, shift down}}
+        delay 2
         
-        -- Close without saving
-        tell application "System Events"
-            keystroke "w" using {{command down}}
-            delay 0.5
-            keystroke "d" using {{command down}}  -- Don't save
-        end tell
+        -- Set output path in save dialog
+        keystroke "g" using {{command down, shift down}}
+        delay 0.5
+        keystroke {_applescript_string(str(output_wav_path.parent))}
+        delay 0.5
+        keystroke return
+        delay 1
         
-        quit
+        -- Set filename
+        keystroke "a" using {{command down}}
+        keystroke {_applescript_string(output_wav_path.name)}
+        delay 0.5
+        keystroke return
     end tell
     '''
     
+    # Close without saving once the WAV is written
+    close_script = '''
+    tell application "System Events"
+        keystroke "w" using {command down}
+        delay 0.5
+        keystroke "d" using {command down}  -- Don't save
+    end tell
+    
+    tell application "Synthesizer V Studio 2 Pro" to quit
+    '''
+    
     try:
-        print("[SYNTHV_AUTOMATION] Launching Synth V...")
+        logger.info("[SYNTHV_AUTOMATION] Launching Synth V...")
+        started = time.monotonic()
         result = subprocess.run(
-            ['osascript', '-e', applescript],
+            ['osascript', '-e', trigger_script],
             capture_output=True,
             text=True,
             timeout=timeout
         )
         
         if result.returncode != 0:
-            print(f"[SYNTHV_AUTOMATION] AppleScript error: {result.stderr}")
+            logger.error("[SYNTHV_AUTOMATION] AppleScript error: %s", result.stderr)
             raise Exception(f"Automation failed: {result.stderr}")
         
-        # Wait a bit more for file to be written
-        time.sleep(2)
+        # Wait for the render to finish writing the WAV
+        try:
+            remaining = timeout - (time.monotonic() - started)
+            if not _wait_for_file(output_wav_path, remaining):
+                raise Exception(f"WAV file not found at: {output_wav_path}")
+        finally:
+            subprocess.run(['osascript', '-e', close_script], capture_output=True, timeout=30)
         
-        # Check if WAV was created
-        if not output_wav_path.exists():
-            raise Exception(f"WAV file not found at: {output_wav_path}")
-        
-        wav_size = output_wav_path.stat().st_size
-        print(f"[SYNTHV_AUTOMATION] Success! WAV size: {wav_size} bytes")
-        print(f"[SYNTHV_AUTOMATION] Complete: {output_wav_path}")
+        if logger.isEnabledFor(logging.INFO):
+            wav_size = output_wav_path.stat().st_size
+            logger.info("[SYNTHV_AUTOMATION] Complete: %s (%d bytes)", output_wav_path, wav_size)
         
         return output_wav_path
         
@@ -132,7 +138,81 @@ def render_vocals_with_synthv(
         raise Exception(f"Synth V automation failed: {e}")
 
 
+def _wait_for_file(path: Path, timeout: float, interval: float = 0.1) -> bool:
+    """
+    Poll until a file exists and has stopped growing.
+    
+    Args:
+        path: File being written by another process
+        timeout: Maximum seconds to wait
+        interval: Seconds between existence checks
+    
+    Returns:
+        True once the file is complete, False on timeout
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        if path.exists() and _size_stable(path):
+            return True
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(interval)
+
+
+def _size_stable(path: Path, sample_interval: float = 0.2) -> bool:
+    """Return True if a non-empty file's size is unchanged across two samples."""
+    try:
+        size = path.stat().st_size
+        time.sleep(sample_interval)
+        return size > 0 and path.stat().st_size == size
+    except FileNotFoundError:
+        return False
+
+
+def _render_with_command(command: str, midi_path: Path, output_wav_path: Path, timeout: int) -> Path:
+    """
+    Render with a configured headless command (SYNTHV_RENDER_COMMAND).
+    
+    Args:
+        command: Command line with "{input}" and "{output}" placeholders
+        midi_path: Path to MIDI file with embedded lyrics
+        output_wav_path: Where the command should write the WAV
+        timeout: Maximum seconds to wait for render
+    
+    Returns:
+        Path to rendered WAV file
+    """
+    args = [
+        part.replace("{input}", str(midi_path)).replace("{output}", str(output_wav_path))
+        for part in shlex.split(command)
+    ]
+    logger.info("[SYNTHV_AUTOMATION] Rendering with %s", args[0])
+    
+    try:
+        result = subprocess.run(args, capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        raise Exception(f"Synth V render timed out after {timeout} seconds")
+    except OSError as e:
+        raise Exception(f"Synth V render command failed to start: {e}")
+    
+    if result.returncode != 0:
+        logger.error("[SYNTHV_AUTOMATION] Render error: %s", result.stderr)
+        raise Exception(f"Synth V render failed: {result.stderr}")
+    if not output_wav_path.exists():
+        raise Exception(f"WAV file not found at: {output_wav_path}")
+    
+    logger.info("[SYNTHV_AUTOMATION] Complete: %s", output_wav_path)
+    return output_wav_path
+
+
+def _applescript_string(value: str) -> str:
+    """Quote a Python string as an AppleScript string literal."""
+    return '"' + value.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    
     # Test the automation
     test_midi = Path("output/midi/test_with_lyrics.mid")
     test_wav = Path("output/audio/test_synthv_automation.wav")
@@ -3,45 +3,42 @@ Synthesizer V + REAPER client for AI singing synthesis.
 Generates REAPER projects with Synth V VST and renders singing audio.
 """
 
-import subprocess
+import errno
+import hashlib
+import logging
+import os
+import shlex
+import string
+import threading
 import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, List, Optional, Tuple
 from scripts.utils import cfg
 
+logger = logging.getLogger(__name__)
 
-def create_reaper_project(
-    musicxml_path: Path,
-    output_rpp_path: Path,
-    voice: Optional[str] = None
-) -> Path:
-    """
-    Generate a REAPER project file (.rpp) that loads Synth V VST with MusicXML.
-    
-    Args:
-        musicxml_path: Path to MusicXML file with lyrics
-        output_rpp_path: Where to save the .rpp project file
-        voice: Synth V voice to use (default from config)
-    
-    Returns:
-        Path to created .rpp file
-    """
-    if voice is None:
-        voice = cfg.SYNTHV_VOICE
-    
-    print(f"[CREATE_REAPER_PROJECT] Starting")
-    print(f"[CREATE_REAPER_PROJECT] MusicXML input: {musicxml_path}")
-    print(f"[CREATE_REAPER_PROJECT] MusicXML exists: {musicxml_path.exists()}")
-    print(f"[CREATE_REAPER_PROJECT] Voice: {voice}")
-    print(f"[CREATE_REAPER_PROJECT] VST path: {cfg.SYNTHV_VST_PATH}")
-    print(f"[CREATE_REAPER_PROJECT] VST exists: {Path(cfg.SYNTHV_VST_PATH).exists()}")
-    print(f"[CREATE_REAPER_PROJECT] Output RPP: {output_rpp_path}")
-    
-    # REAPER project file format
-    # This is a simplified version - real .rpp files are more complex
-    # We'll create a minimal project that loads Synth V VST
-    
-    rpp_content = f"""<REAPER_PROJECT 0.1 "7.0"
+# Write buffer for project files (a project is a few KB)
+_RPP_WRITE_BUFFER = 1 << 16
+
+# REAPER output kept per stream (only the end is useful for errors)
+_OUTPUT_TAIL_BYTES = 8192
+_PIPE_READ_SIZE = 4096
+
+# REAPER prints this once the render is written; it sometimes keeps running
+# afterwards, so the process is only given a short grace period to exit
+_RENDER_DONE_MARKER = b'Render complete'
+_RENDER_EXIT_GRACE = 5
+
+# Opaque Synth V plugin state (base64) stored in the project's <VST> block
+_VST_STATE_1 = "Y3NldnQD////////////////AAAAAAAAAAAAAAABAAAAAAAAAAEAAAABAAAADwAAAA=="
+_VST_STATE_2 = "776t3g3wrd7fBgAAEAAAAAAAAAASAAAAAAAAAOxMpQABAAAAAQAAAA=="
+
+# REAPER project file format
+# This is a simplified version - real .rpp files are more complex
+# We'll create a minimal project that loads Synth V VST
+_RPP_TEMPLATE = string.Template("""<REAPER_PROJECT 0.1 "7.0"
   RIPPLE 0
   GROUPOVERRIDE 0 0 0
   AUTOXFADE 1
@@ -84,7 +81,7 @@ def create_reaper_project(
   ITEMMIX 0
   DEFPITCHMODE 589824 0
   TAKELANE 1
-  SAMPLERATE 44100 0 0
+  SAMPLERATE ${sample_rate} 0 0
   <RENDER_CFG
   >
   LOCK 1
@@ -110,7 +107,7 @@ def create_reaper_project(
   MASTER_VOLUME 1 0 -1 -1 1
   MASTER_FX 1
   MASTER_SEL 0
-  <TRACK {{00000000-0000-0000-0000-000000000000}}
+  <TRACK {00000000-0000-0000-0000-000000000000}
     NAME "Vocals - Synth V"
     PEAKCOL 16576
     BEAT -1
@@ -129,7 +126,7 @@ def create_reaper_project(
     INQ 0 0 0 0.5 100 0 0 100
     NCHAN 2
     FX 1
-    TRACKID {{00000000-0000-0000-0000-000000000001}}
+    TRACKID {00000000-0000-0000-0000-000000000001}
     PERF 0
     MIDIOUT -1
     MAINSEND 1 0
@@ -139,31 +136,79 @@ def create_reaper_project(
       LASTSEL 0
       DOCKED 0
       BYPASS 0 0 0
-      <VST "VST3: Synthesizer V Studio 2 Pro (Dreamtonics)" "{cfg.SYNTHV_VST_PATH}"
-        Y3NldnQD////////////////AAAAAAAAAAAAAAABAAAAAAAAAAEAAAABAAAADwAAAA==
-        776t3g3wrd7fBgAAEAAAAAAAAAASAAAAAAAAAOxMpQABAAAAAQAAAA==
+      <VST "VST3: Synthesizer V Studio 2 Pro (Dreamtonics)" "${vst_path}"
+        ${state1}
+        ${state2}
       >
     </FXCHAIN>
   >
 >
-"""
+""")
+
+# The template pre-encoded around the two per-call values (sample rate and
+# VST path); the plugin state never changes, so it is baked into the tail
+_RPP_HEAD, _RPP_MID, _RPP_TAIL = (
+    part.encode('utf-8')
+    for part in _RPP_TEMPLATE.safe_substitute(state1=_VST_STATE_1, state2=_VST_STATE_2)
+    .replace('${sample_rate}', '${vst_path}')
+    .split('${vst_path}')
+)
+
+
+def create_reaper_project(
+    musicxml_path: Path,
+    output_rpp_path: Path,
+    voice: Optional[str] = None,
+    _skip_mkdir: bool = False
+) -> Path:
+    """
+    Generate a REAPER project file (.rpp) that loads Synth V VST with MusicXML.
     
-    # Create output directory
-    output_rpp_path.parent.mkdir(parents=True, exist_ok=True)
+    Args:
+        musicxml_path: Path to MusicXML file with lyrics
+        output_rpp_path: Where to save the .rpp project file
+        voice: Synth V voice to use (default from config)
     
-    # Write project file
-    with open(output_rpp_path, 'w') as f:
-        f.write(rpp_content)
+    Returns:
+        Path to created .rpp file
+    """
+    if voice is None:
+        voice = cfg.get_config().synthv_voice
     
-    print(f"[CREATE_REAPER_PROJECT] RPP file written: {output_rpp_path.stat().st_size} bytes")
-    print(f"[CREATE_REAPER_PROJECT] Complete")
+    if logger.isEnabledFor(logging.DEBUG):
+        vst_path = cfg.get_config().synthv_vst_path
+        logger.debug("[CREATE_REAPER_PROJECT] MusicXML input: %s", musicxml_path)
+        logger.debug("[CREATE_REAPER_PROJECT] Voice: %s", voice)
+        logger.debug("[CREATE_REAPER_PROJECT] VST path: %s", vst_path)
+        logger.debug("[CREATE_REAPER_PROJECT] Output RPP: %s", output_rpp_path)
+    
+    config = cfg.get_config()
+    rpp_data = b''.join((
+        _RPP_HEAD,
+        str(config.sample_rate).encode('ascii'),
+        _RPP_MID,
+        config.synthv_vst_path.encode('utf-8'),
+        _RPP_TAIL,
+    ))
+    
+    # Create output directory (unless the caller already did)
+    if not _skip_mkdir:
+        output_rpp_path.parent.mkdir(parents=True, exist_ok=True)
+    
+    # Write project file: binary mode (no newline translation) with a buffer
+    # larger than the whole project, so it goes out in a single write
+    with open(output_rpp_path, 'wb', buffering=_RPP_WRITE_BUFFER) as f:
+        f.write(rpp_data)
+    
+    logger.debug("[CREATE_REAPER_PROJECT] RPP file written: %d bytes", len(rpp_data))
     return output_rpp_path
 
 
 def render_with_reaper(
     rpp_project_path: Path,
     output_wav_path: Path,
-    timeout: int = 120
+    timeout: int = 120,
+    _skip_mkdir: bool = False
 ) -> Path:
     """
     Render a REAPER project to WAV using command line.
@@ -171,7 +216,9 @@ def render_with_reaper(
     Args:
         rpp_project_path: Path to .rpp project file
         output_wav_path: Where to save the rendered WAV
-        timeout: Maximum seconds to wait for render (default: 120)
+        timeout: Maximum seconds to wait for render (default: 120). Once
+            REAPER reports the render complete it only gets
+            _RENDER_EXIT_GRACE more seconds to exit before being killed
     
     Returns:
         Path to rendered WAV file
@@ -179,69 +226,76 @@ def render_with_reaper(
     Raises:
         Exception: If rendering fails or times out
     """
-    print(f"[RENDER_WITH_REAPER] Starting")
-    print(f"[RENDER_WITH_REAPER] REAPER executable: {cfg.REAPER_EXECUTABLE}")
-    print(f"[RENDER_WITH_REAPER] REAPER exists: {Path(cfg.REAPER_EXECUTABLE).exists()}")
-    print(f"[RENDER_WITH_REAPER] Project file: {rpp_project_path}")
-    print(f"[RENDER_WITH_REAPER] Project exists: {rpp_project_path.exists()}")
-    print(f"[RENDER_WITH_REAPER] Output WAV: {output_wav_path}")
-    
-    # Ensure output directory exists
-    output_wav_path.parent.mkdir(parents=True, exist_ok=True)
+    # Only rendering runs processes; projects can be generated without
+    # paying for the subprocess import
+    import subprocess
+    
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("[RENDER_WITH_REAPER] REAPER executable: %s", cfg.get_config().reaper_executable)
+        logger.debug("[RENDER_WITH_REAPER] Project file: %s", rpp_project_path)
+        logger.debug("[RENDER_WITH_REAPER] Output WAV: %s", output_wav_path)
+    
+    # Ensure output directory exists (unless the caller already did)
+    if not _skip_mkdir:
+        output_wav_path.parent.mkdir(parents=True, exist_ok=True)
     
     # Call REAPER CLI to render project
     cmd = [
-        cfg.REAPER_EXECUTABLE,
+        cfg.get_config().reaper_executable,
         '-renderproject', str(rpp_project_path)
     ]
     
-    print(f"[RENDER_WITH_REAPER] Command: {' '.join(cmd)}")
-    print(f"[RENDER_WITH_REAPER] Timeout: {timeout}s")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("[RENDER_WITH_REAPER] Command: %s (timeout %ss)", shlex.join(cmd), timeout)
     
     try:
         start_time = time.time()
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=timeout
-        )
+        try:
+            returncode, stdout_tail, stderr_tail = _run_with_output_tail(cmd, timeout, _RENDER_DONE_MARKER)
+        except FileNotFoundError:
+            # Only place the executable is looked up; no separate exists() probe
+            raise Exception(f"REAPER executable not found: {cmd[0]} (check REAPER_EXECUTABLE)")
         elapsed = time.time() - start_time
         
-        print(f"[RENDER_WITH_REAPER] Process completed in {elapsed:.1f}s")
-        print(f"[RENDER_WITH_REAPER] Return code: {result.returncode}")
+        logger.debug("[RENDER_WITH_REAPER] Process completed in %.1fs with return code %d", elapsed, returncode)
         
-        if result.stdout:
-            print(f"[RENDER_WITH_REAPER] STDOUT: {result.stdout[:200]}")
-        if result.stderr:
-            print(f"[RENDER_WITH_REAPER] STDERR: {result.stderr[:200]}")
+        if logger.isEnabledFor(logging.DEBUG):
+            if stdout_tail:
+                logger.debug("[RENDER_WITH_REAPER] STDOUT (tail): %s", _tail_text(stdout_tail)[-200:])
+            if stderr_tail:
+                logger.debug("[RENDER_WITH_REAPER] STDERR (tail): %s", _tail_text(stderr_tail)[-200:])
         
-        if result.returncode != 0:
-            print(f"[RENDER_WITH_REAPER] ERROR: Rendering failed")
-            raise Exception(f"REAPER rendering failed: {result.stderr}")
+        if returncode != 0:
+            logger.error("[RENDER_WITH_REAPER] Rendering failed")
+            raise Exception(f"REAPER rendering failed: {_tail_text(stderr_tail)}")
         
         # Check if output file was created
-        print(f"[RENDER_WITH_REAPER] Checking for output WAV...")
-        if not output_wav_path.exists():
-            print(f"[RENDER_WITH_REAPER] WAV not at expected location: {output_wav_path}")
+        try:
+            wav_size = os.stat(output_wav_path).st_size
+        except FileNotFoundError:
+            wav_size = None
+        
+        if wav_size is None:
             # REAPER might have saved to a different location
             project_dir = rpp_project_path.parent
-            print(f"[RENDER_WITH_REAPER] Searching in: {project_dir}")
-            possible_outputs = list(project_dir.glob("*.wav"))
-            print(f"[RENDER_WITH_REAPER] Found {len(possible_outputs)} WAV files")
-            if possible_outputs:
-                print(f"[RENDER_WITH_REAPER] Moving {possible_outputs[0]} to {output_wav_path}")
-                import shutil
-                shutil.move(str(possible_outputs[0]), str(output_wav_path))
+            logger.debug("[RENDER_WITH_REAPER] WAV not at %s, searching in %s", output_wav_path, project_dir)
+            # First non-hidden *.wav in directory order (what glob("*.wav")[0] gave)
+            with os.scandir(project_dir) as entries:
+                found = next(
+                    (e for e in entries if e.name.endswith('.wav') and not e.name.startswith('.')),
+                    None
+                )
+            if found is not None:
+                logger.debug("[RENDER_WITH_REAPER] Moving %s to %s", found.path, output_wav_path)
+                _move_file(found.path, output_wav_path)
             else:
-                print(f"[RENDER_WITH_REAPER] ERROR: No WAV files found")
+                logger.error("[RENDER_WITH_REAPER] No WAV files found in %s", project_dir)
                 raise Exception(f"Rendered WAV not found at: {output_wav_path}")
-        else:
-            print(f"[RENDER_WITH_REAPER] WAV found at expected location")
         
-        wav_size = output_wav_path.stat().st_size
-        print(f"[RENDER_WITH_REAPER] WAV size: {wav_size} bytes ({wav_size/1024:.1f} KB)")
-        print(f"[RENDER_WITH_REAPER] Complete")
+        if wav_size is not None:
+            logger.info("[RENDER_WITH_REAPER] Rendered %s (%.1f KB)", output_wav_path, wav_size / 1024)
+        else:
+            logger.info("[RENDER_WITH_REAPER] Rendered %s", output_wav_path)
         return output_wav_path
         
     except subprocess.TimeoutExpired:
@@ -250,6 +304,185 @@ def render_with_reaper(
         raise Exception(f"REAPER rendering failed: {e}")
 
 
+def _run_with_output_tail(
+    cmd: List[str],
+    timeout: float,
+    done_marker: Optional[bytes] = None
+) -> Tuple[int, deque, deque]:
+    """
+    Run a command, keeping only the last _OUTPUT_TAIL_BYTES of stdout/stderr.
+    
+    Reader threads drain both pipes into bounded ring buffers as the process
+    runs, so a chatty process can't fill a pipe and block, and memory stays
+    fixed however much it logs.
+    
+    Args:
+        cmd: Command and arguments
+        timeout: Maximum seconds to wait for the process
+        done_marker: If given, stdout containing it means the work is done:
+            the process then gets _RENDER_EXIT_GRACE seconds to exit, and is
+            killed (with returncode 0 reported) if it lingers
+    
+    Returns:
+        Tuple (returncode, stdout_tail, stderr_tail); use _tail_text() to
+        decode a tail
+    
+    Raises:
+        subprocess.TimeoutExpired: If the process outlives timeout (it is killed)
+    """
+    import subprocess
+    
+    deadline = time.monotonic() + timeout
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    tails = (deque(maxlen=_OUTPUT_TAIL_BYTES), deque(maxlen=_OUTPUT_TAIL_BYTES))
+    # Set when stdout shows done_marker or reaches EOF (the process exiting)
+    stdout_done = threading.Event()
+    marker_seen = threading.Event()
+    readers = [
+        threading.Thread(target=_drain_pipe, args=(proc.stdout, tails[0], done_marker, marker_seen, stdout_done), daemon=True),
+        threading.Thread(target=_drain_pipe, args=(proc.stderr, tails[1]), daemon=True),
+    ]
+    for reader in readers:
+        reader.start()
+    
+    killed = False
+    try:
+        returncode = None
+        if done_marker is not None and stdout_done.wait(timeout) and marker_seen.is_set():
+            remaining = deadline - time.monotonic()
+            try:
+                returncode = proc.wait(timeout=max(0, min(_RENDER_EXIT_GRACE, remaining)))
+            except subprocess.TimeoutExpired:
+                logger.debug("[RENDER_WITH_REAPER] Render complete but process still running; killing it")
+                proc.kill()
+                proc.wait()
+                killed = True
+                returncode = 0
+        if returncode is None:
+            returncode = proc.wait(timeout=max(0, deadline - time.monotonic()))
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+        killed = True
+        raise
+    finally:
+        # After a kill, a child process may still hold the pipes open; the
+        # daemon readers are left to finish on their own rather than
+        # delaying the caller. Otherwise wait no later than the deadline.
+        if not killed:
+            for reader in readers:
+                reader.join(timeout=max(0, deadline - time.monotonic()))
+    
+    return returncode, tails[0], tails[1]
+
+
+def _drain_pipe(
+    pipe,
+    tail: deque,
+    marker: Optional[bytes] = None,
+    marker_seen: Optional[threading.Event] = None,
+    done: Optional[threading.Event] = None
+) -> None:
+    """
+    Read a pipe to EOF, keeping only what fits in the tail buffer.
+    
+    If marker is given, marker_seen is set when it appears in the output
+    (also across chunk boundaries), and done is set then or at EOF.
+    """
+    carry = b''
+    try:
+        with pipe:
+            for chunk in iter(lambda: pipe.read1(_PIPE_READ_SIZE), b''):
+                tail.extend(chunk)
+                if marker is not None and not marker_seen.is_set():
+                    window = carry + chunk
+                    if marker in window:
+                        marker_seen.set()
+                        done.set()
+                    carry = window[-(len(marker) - 1):] if len(marker) > 1 else b''
+    finally:
+        if done is not None:
+            done.set()
+
+
+def _tail_text(tail: deque) -> str:
+    """Decode a captured output tail (a cut multi-byte character is replaced)."""
+    return bytes(tail).decode('utf-8', errors='replace')
+
+
+class ReaperPool:
+    """
+    Run several REAPER renders at once.
+    
+    REAPER's command line renders one project per process and has no way to
+    feed further projects to a running instance, so the pool overlaps whole
+    render_with_reaper() calls instead: each worker thread waits on its own
+    REAPER process while the others start up and render. REAPER must be
+    allowed to run multiple instances, and concurrent jobs should not share a
+    project directory (the misplaced-WAV fallback takes any *.wav there).
+    
+    Example:
+        with ReaperPool(max_workers=4) as pool:
+            wavs = pool.map([(rpp_a, wav_a), (rpp_b, wav_b)])
+    """
+    
+    def __init__(self, max_workers: Optional[int] = None, timeout: int = 120):
+        """
+        Args:
+            max_workers: Concurrent REAPER processes (default: CPU count)
+            timeout: Per-render timeout in seconds
+        """
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or os.cpu_count() or 1,
+            thread_name_prefix="reaper",
+        )
+    
+    def submit(self, rpp_project_path: Path, output_wav_path: Path) -> Future:
+        """Queue one project; the future resolves to the rendered WAV path."""
+        return self._executor.submit(render_with_reaper, rpp_project_path, output_wav_path, self.timeout)
+    
+    def map(self, jobs: Iterable[Tuple[Path, Path]]) -> List[Path]:
+        """
+        Render (rpp_project_path, output_wav_path) pairs concurrently.
+        
+        Returns:
+            Rendered WAV paths in job order (the first failure is re-raised)
+        """
+        futures = [self.submit(rpp, wav) for rpp, wav in jobs]
+        return [future.result() for future in futures]
+    
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting jobs and optionally wait for running renders."""
+        self._executor.shutdown(wait=wait)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown()
+
+
+def _move_file(src, dst) -> None:
+    """
+    Move a file, renaming in place when possible.
+    
+    os.replace is a single rename on the same filesystem. Across volumes
+    (EXDEV) the file is copied with shutil.copyfile, which uses the OS fast
+    path (sendfile on Linux, fcopyfile on macOS, 1 MiB chunks on Windows),
+    then the source is removed. Unlike shutil.move this skips a second
+    rename attempt and copying metadata.
+    """
+    try:
+        os.replace(src, dst)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        import shutil
+        shutil.copyfile(src, dst)
+        os.unlink(src)
+
+
 def generate_singing_audio(
     musicxml_path: Path,
     output_wav_path: Path,
@@ -262,6 +495,9 @@ def generate_singing_audio(
     1. Create REAPER project with Synth V VST
     2. Render the project to WAV
     
+    A hash of the inputs is stored next to the WAV (.key); if it matches on
+    a later call and the WAV exists, both steps are skipped.
+    
     Args:
         musicxml_path: Path to MusicXML file with embedded lyrics
         output_wav_path: Where to save the singing WAV
@@ -270,22 +506,54 @@ def generate_singing_audio(
     Returns:
         Path to generated singing WAV file
     """
-    print(f"[GENERATE_SINGING_AUDIO] Starting")
-    print(f"[GENERATE_SINGING_AUDIO] MusicXML: {musicxml_path}")
-    print(f"[GENERATE_SINGING_AUDIO] Output WAV: {output_wav_path}")
-    print(f"[GENERATE_SINGING_AUDIO] Voice: {voice or cfg.SYNTHV_VOICE}")
+    logger.info("[GENERATE_SINGING_AUDIO] Starting: %s -> %s", musicxml_path, output_wav_path)
+    logger.debug("[GENERATE_SINGING_AUDIO] Voice: %s", voice or cfg.get_config().synthv_voice)
+    
+    # Skip everything if this exact request was already rendered
+    render_key = _render_key(musicxml_path, voice or cfg.get_config().synthv_voice)
+    key_path = output_wav_path.with_suffix('.key')
+    if render_key is not None and output_wav_path.exists():
+        try:
+            if key_path.read_text() == render_key:
+                logger.info("[GENERATE_SINGING_AUDIO] Up to date, reusing: %s", output_wav_path)
+                return output_wav_path
+        except FileNotFoundError:
+            pass
     
-    # Create temporary REAPER project file
+    # Create temporary REAPER project file next to the WAV; both steps
+    # write to this directory, so create it once here
     rpp_path = output_wav_path.with_suffix('.rpp')
+    output_wav_path.parent.mkdir(parents=True, exist_ok=True)
     
     # Step 1: Create REAPER project
-    print(f"[GENERATE_SINGING_AUDIO] Step 1: Creating REAPER project...")
-    create_reaper_project(musicxml_path, rpp_path, voice)
+    logger.debug("[GENERATE_SINGING_AUDIO] Step 1: Creating REAPER project...")
+    create_reaper_project(musicxml_path, rpp_path, voice, _skip_mkdir=True)
     
     # Step 2: Render with REAPER
-    print(f"[GENERATE_SINGING_AUDIO] Step 2: Rendering with REAPER...")
-    render_with_reaper(rpp_path, output_wav_path)
+    logger.debug("[GENERATE_SINGING_AUDIO] Step 2: Rendering with REAPER...")
+    render_with_reaper(rpp_path, output_wav_path, _skip_mkdir=True)
+    
+    if render_key is not None:
+        key_path.write_text(render_key)
     
-    print(f"[GENERATE_SINGING_AUDIO] Complete: {output_wav_path}")
+    logger.info("[GENERATE_SINGING_AUDIO] Complete: %s", output_wav_path)
     return output_wav_path
 
+
+def _render_key(musicxml_path: Path, voice: str) -> Optional[str]:
+    """
+    Hash everything a render depends on: the MusicXML, voice, and project settings.
+    
+    Returns:
+        Hex digest, or None if the MusicXML can't be read (no caching then)
+    """
+    config = cfg.get_config()
+    try:
+        data = musicxml_path.read_bytes()
+    except OSError:
+        return None
+    
+    h = hashlib.blake2b(data, digest_size=8)
+    for part in (voice, str(config.sample_rate), config.synthv_vst_path):
+        h.update(b'\0' + part.encode('utf-8'))
+    return h.hexdigest()
@@ -2,30 +2,38 @@
 Quick test to verify PySinsy is installed and working.
 """
 
-import pysinsy
+import sys
 
-print("Testing PySinsy installation...")
-print(f"PySinsy version: {pysinsy.__version__ if hasattr(pysinsy, '__version__') else 'unknown'}")
 
-# Try to initialize
-try:
-    sinsy = pysinsy.Sinsy()
-    print("✓ Sinsy object created successfully")
+def main():
+    print("Testing PySinsy installation...")
     
-    # Check for language dictionaries
-    default_dic = pysinsy.get_default_dic_dir()
-    print(f"✓ Default dictionary directory: {default_dic}")
-    
-    # Try to set English language
-    result = sinsy.setLanguages("en", default_dic)
-    if result:
-        print("✓ English language set successfully")
-    else:
-        print("⚠ Warning: Could not set English language (might need dictionary files)")
-    
-    print("\n✓ PySinsy is installed and ready to use!")
-    
-except Exception as e:
-    print(f"\n✗ Error: {e}")
-    print("PySinsy may need additional setup or dictionary files")
+    # Try to initialize (pysinsy is imported here so importing this module is cheap)
+    try:
+        import pysinsy
+        print(f"PySinsy version: {pysinsy.__version__ if hasattr(pysinsy, '__version__') else 'unknown'}")
+        
+        sinsy = pysinsy.Sinsy()
+        print("✓ Sinsy object created successfully")
+        
+        # Check for language dictionaries
+        default_dic = pysinsy.get_default_dic_dir()
+        print(f"✓ Default dictionary directory: {default_dic}")
+        
+        # Try to set English language
+        result = sinsy.setLanguages("en", default_dic)
+        if result:
+            print("✓ English language set successfully")
+        else:
+            print("⚠ Warning: Could not set English language (might need dictionary files)")
+        
+        print("\n✓ PySinsy is installed and ready to use!")
+        
+    except Exception as e:
+        print(f"\n✗ Error: {e}")
+        print("PySinsy may need additional setup or dictionary files")
+        sys.exit(1)
+
 
+if __name__ == "__main__":
+    main()
@@ -2,8 +2,10 @@
 Test PySinsy vocal generation with a simple example.
 """
 
+import sys
 from pathlib import Path
 from scripts.midi.generate_vocal_melody import generate_vocal_audio
+from scripts.utils.midi_utils import LyricNote
 
 # Create simple test data
 vocal_data = {
@@ -21,26 +23,32 @@ vocal_data = {
 # Word mapping (word, pitch, start_time_seconds, duration_seconds)
 # At 120 BPM, 1 beat = 0.5 seconds
 word_mapping = [
-    ("Hello", 60, 0.0, 0.5),
-    ("my", 62, 0.5, 0.5),
-    ("dear", 64, 1.0, 0.5),
-    ("friend", 65, 1.5, 1.0),
+    LyricNote("Hello", 60, 0.0, 0.5),
+    LyricNote("my", 62, 0.5, 0.5),
+    LyricNote("dear", 64, 1.0, 0.5),
+    LyricNote("friend", 65, 1.5, 1.0),
 ]
 
 # Output path
 output_path = Path("output/audio/test_pysinsy_vocals.wav")
 
-print("Testing PySinsy vocal generation...")
-print(f"Notes: {len(vocal_data['notes'])}")
-print(f"Lyrics: {' '.join([w[0] for w in word_mapping])}")
-print()
 
-try:
-    wav_path = generate_vocal_audio(vocal_data, word_mapping, output_path)
-    print(f"\n✓ Success! Generated: {wav_path}")
-    print("\nPlay the file to hear PySinsy singing!")
-except Exception as e:
-    print(f"\n✗ Error: {e}")
-    import traceback
-    traceback.print_exc()
+def main():
+    print("Testing PySinsy vocal generation...")
+    print(f"Notes: {len(vocal_data['notes'])}")
+    print(f"Lyrics: {' '.join(note.text for note in word_mapping)}")
+    print()
+    
+    try:
+        wav_path = generate_vocal_audio(vocal_data, word_mapping, output_path)
+        print(f"\n✓ Success! Generated: {wav_path}")
+        print("\nPlay the file to hear PySinsy singing!")
+    except Exception as e:
+        print(f"\n✗ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
 
+
+if __name__ == "__main__":
+    main()
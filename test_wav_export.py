@@ -12,10 +12,29 @@ This will:
 4. Keep both files so you can listen!
 """
 
+import functools
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from scripts.audio.render_midi import render_complete_song_wav, render_instrumental_wav
 
+# Render callbacks run on worker threads; keep their lines from interleaving
+_print_lock = threading.Lock()
+
+
+def _report_render(label, wav_path, future):
+    """Print the outcome of one render as soon as it finishes."""
+    error = future.exception()
+    if error is not None:
+        message = f"  ❌ {label} failed: {error}"
+    else:
+        size_mb = wav_path.stat().st_size / (1024 * 1024)
+        message = f"  ✅ {label}: {wav_path.name} ({size_mb:.2f} MB)"
+    with _print_lock:
+        print(message)
+
+
 def main():
     if len(sys.argv) < 2:
         print("Usage: python test_wav_export.py <song_base_name>")
@@ -63,28 +82,22 @@ def main():
     print(f"MIDI: {midi_file.name}")
     print()
     
-    # Render complete WAV
-    print("Step 1/2: Rendering complete WAV (with vocals)...")
+    # Render complete and instrumental WAVs in parallel (independent FluidSynth runs)
+    print("Rendering complete WAV (with vocals) and instrumental WAV (no vocals) in parallel...")
     print("  This may take 10-30 seconds...")
-    try:
-        render_complete_song_wav(midi_file, complete_wav)
-        size_mb = complete_wav.stat().st_size / (1024 * 1024)
-        print(f"  ✅ Complete WAV: {complete_wav.name} ({size_mb:.2f} MB)")
-    except Exception as e:
-        print(f"  ❌ Failed: {e}")
-        sys.exit(1)
-    
-    print()
+    jobs = [
+        ("Complete WAV", render_complete_song_wav, complete_wav),
+        ("Instrumental WAV", render_instrumental_wav, instrumental_wav),
+    ]
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = []
+        for label, render, wav_path in jobs:
+            future = executor.submit(render, midi_file, wav_path)
+            future.add_done_callback(functools.partial(_report_render, label, wav_path))
+            futures.append(future)
+        failed = [future for future in as_completed(futures) if future.exception() is not None]
     
-    # Render instrumental WAV
-    print("Step 2/2: Rendering instrumental WAV (no vocals)...")
-    print("  This may take 10-30 seconds...")
-    try:
-        render_instrumental_wav(midi_file, instrumental_wav)
-        size_mb = instrumental_wav.stat().st_size / (1024 * 1024)
-        print(f"  ✅ Instrumental WAV: {instrumental_wav.name} ({size_mb:.2f} MB)")
-    except Exception as e:
-        print(f"  ❌ Failed: {e}")
+    if failed:
         sys.exit(1)
     
     print()
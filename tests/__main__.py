@@ -0,0 +1,54 @@
+"""
+Run the manual test scripts in a single Python process.
+
+Each script is imported once and its main() called in turn, so the scripts.*
+package (MIDI utils, LLM client, etc.) is only imported once for the batch.
+
+Usage (from the project root):
+    python -m tests                    # all scripts that take no arguments
+    python -m tests <song_base_name>   # also run test_wav_export for that song
+"""
+
+import importlib
+import sys
+import traceback
+
+# Scripts in the project root that expose main(), in run order
+TEST_MODULES = [
+    "test_midi_lyrics",
+    "test_pysinsy",
+    "test_pysinsy_vocals",
+    "test_piper",
+]
+
+
+def main():
+    modules = list(TEST_MODULES)
+    if len(sys.argv) > 1:
+        # test_wav_export reads the song name from sys.argv[1]
+        modules.append("test_wav_export")
+
+    failed = []
+    for name in modules:
+        print("=" * 60)
+        print(f"▶ {name}")
+        print("=" * 60)
+        try:
+            importlib.import_module(name).main()
+        except SystemExit as e:
+            if e.code not in (None, 0):
+                failed.append(name)
+        except Exception:
+            traceback.print_exc()
+            failed.append(name)
+        print()
+
+    print("=" * 60)
+    print(f"{len(modules) - len(failed)}/{len(modules)} passed")
+    for name in failed:
+        print(f"  ✗ {name}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()